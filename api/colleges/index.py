@@ -1,7 +1,121 @@
 from flask import Flask, request, jsonify
+from array import array
+from bisect import bisect_right
+import json
+import math
+import os
+import struct
+import sys
 
 app = Flask(__name__)
 
+# Prebuilt read-only college index (generated by backend/serverless_index.py)
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'josaa_2024.idx')
+MAGIC = b'JOSAAIDX'
+FORMAT_VERSION = 2
+
+# Eligible if Closing Rank >= DEFAULT_RANK_MARGIN * category rank (10% error margin)
+DEFAULT_RANK_MARGIN = 0.9
+
+# Default log-scale standard deviation of the category rank (backend/admission_chance.py)
+RANK_UNCERTAINTY = 0.1
+
+# /api/colleges fields the Flask backend supports and this function does not:
+# they are rejected rather than ignored, so no request gets a different answer
+UNSUPPORTED_FIELDS = ['institute', 'collegeType', 'managementType', 'salaryTier', 'minSalary', 'branch',
+                      'search', 'sortBy', 'sortOrder', 'facets']
+
+
+class CollegeIndex:
+    """
+    Same presorted (seat type, gender pool, home state) buckets as the backend's
+    college index, stored as flat arrays so no pandas is needed, with what the
+    admission chances are computed from.
+    """
+
+    def __init__(self, path: str = INDEX_PATH):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a college index file")
+        (header_length,) = struct.unpack_from('<I', data, len(MAGIC))
+        offset = len(MAGIC) + 4
+        header = json.loads(data[offset:offset + header_length])
+        offset += header_length
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError("College index is out of date: run backend/serverless_index.py")
+
+        self.year = header['year']
+        self.round = header['round']
+        self.strings = header['strings']
+        self.home_states = set(header['home_states'])
+        self.buckets = header['buckets']
+        self.permille_thresholds = header['permille_thresholds']
+        self.bands = header['bands']
+        for name, typecode, length in header['arrays']:
+            values = array(typecode)
+            values.frombytes(data[offset:offset + length * values.itemsize])
+            if sys.byteorder != 'little':
+                values.byteswap()
+            setattr(self, name, values)
+            offset += length * values.itemsize
+
+    def check_dataset(self, year, round):
+        """Raise ValueError, as the backend registry does, for a year or round this index is not."""
+        year = self.year if year is None else str(year)
+        if year != self.year:
+            raise ValueError(f"Unknown year: {year}")
+        round = self.round if round is None else str(round)
+        if round != self.round:
+            raise ValueError(f"Unknown round for {year}: {round}")
+
+    def eligible_rows(self, seat_type: str, gender: str, state: str, category_rank: int,
+                      margin: float = DEFAULT_RANK_MARGIN) -> list:
+        """Rows with Closing Rank >= margin * category_rank, sorted by closing rank."""
+        gender = 'Male' if gender == 'Male' else 'Female'
+        if state not in self.home_states:
+            state = ''
+        bucket = self.buckets.get(f"{seat_type}|{gender}|{state}")
+        if bucket is None:
+            return []
+        row_offset, start, count = bucket
+        positions = self.bucket_rows[start:start + count]
+
+        # Binary search for the first row with Closing Rank >= threshold
+        threshold = margin * category_rank
+        low, high = 0, count
+        while low < high:
+            mid = (low + high) // 2
+            if self.closing_rank[row_offset + positions[mid]] < threshold:
+                low = mid + 1
+            else:
+                high = mid
+        return [row_offset + position for position in positions[low:]]
+
+    def colleges(self, rows: list, category_rank: int, rank_uncertainty: float = RANK_UNCERTAINTY) -> list:
+        """Records for rows, with the admission chance and band of each (as backend/admission_chance.py)."""
+        strings = self.strings
+        log_rank = math.log(max(float(category_rank), 1.0))
+        rank_variance = rank_uncertainty * rank_uncertainty
+        colleges = []
+        for row in rows:
+            salary = self.salary[row]
+            z = (self.log_closing[row] - log_rank) / math.sqrt(self.cutoff_variance[row] + rank_variance)
+            permille = bisect_right(self.permille_thresholds, z)
+            colleges.append({
+                'College': strings[self.college[row]],
+                'Course': strings[self.course[row]],
+                'State': strings[self.state[row]],
+                'Closing Rank': self.closing_rank[row],
+                'Expected Salary as per NIRF': None if math.isnan(salary) else salary,
+                'Admission Chance': permille / 1000,
+                'Admission Band': next(band for lowest, band in self.bands if permille >= lowest),
+            })
+        return colleges
+
+
+college_index = CollegeIndex()
+
 @app.route('/', defaults={'path': ''}, methods=['POST', 'OPTIONS'])
 @app.route('/<path:path>', methods=['POST', 'OPTIONS'])
 def colleges(path):
@@ -9,11 +123,44 @@ def colleges(path):
         return '', 200
 
     try:
-        # For now, return a message that college feature requires full backend
-        return jsonify({
-            'success': False,
-            'error': 'College recommendations feature requires pandas and large CSV file. Please use the prediction feature only, or deploy backend separately on Render/Railway.'
-        }), 501
+        data = request.json
+        category = data.get('category')
+        category_rank = int(data.get('categoryRank'))
+        gender = data.get('gender')
+        state = data.get('state')
+
+        margin = float(data.get('rankMargin', DEFAULT_RANK_MARGIN))
+        if not margin > 0:
+            raise ValueError("rankMargin must be positive")
+
+        rank_uncertainty = float(data.get('rankUncertainty', RANK_UNCERTAINTY))
+        if not rank_uncertainty >= 0:
+            raise ValueError("rankUncertainty must not be negative")
+
+        # Optional page: `limit` eligible rows starting `offset` rows in
+        paginated = 'offset' in data or 'limit' in data
+        offset = int(data.get('offset', 0))
+        limit = data.get('limit')
+        limit = None if limit is None else int(limit)
+        if offset < 0:
+            raise ValueError("offset must not be negative")
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be positive")
+
+        college_index.check_dataset(data.get('year'), data.get('round'))
+        unsupported = [field for field in UNSUPPORTED_FIELDS if data.get(field) is not None]
+        if 'application/x-ndjson' in request.headers.get('Accept', '') or data.get('format') == 'ndjson':
+            unsupported.append('NDJSON streaming')
+        if unsupported:
+            raise ValueError(f"Not supported by this deployment: {', '.join(unsupported)}")
+
+        rows = college_index.eligible_rows(category, gender, state, category_rank, margin)
+        page = rows[offset:] if limit is None else rows[offset:offset + limit]
+        response = {'success': True, 'colleges': college_index.colleges(page, category_rank, rank_uncertainty)}
+        if paginated:
+            end = min(offset, len(rows)) + len(page)
+            response.update(offset=offset, total=len(rows), nextOffset=None if end >= len(rows) else end)
+        return jsonify(response)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
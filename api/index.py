@@ -3,6 +3,8 @@ import os
 
 # Add parent directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Backend modules import each other as top-level modules (gunicorn runs with --chdir backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
 
 # Import the Flask app from backend
 from backend.app import app
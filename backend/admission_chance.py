@@ -0,0 +1,89 @@
+"""
+Admission chance of a candidate for each program of a college list.
+
+The candidate's true category rank R and the program's closing rank C this
+year are both uncertain, so both are modeled as log-normal:
+- log R is normal around log rank with sd = rank_uncertainty, the spread of
+  the predicted rank
+- log C is normal around log Closing Rank with
+  sd = CUTOFF_FLOOR + CUTOFF_SPREAD * log(Closing / Opening):
+  programs whose admitted ranks span a wide opening-closing range move more
+  between years than single-seat programs
+The chance is P(R <= C) = Phi((log Closing Rank - log rank) / sqrt(var R + var C)),
+so it is above 1/2 while the rank is inside the opening-closing range and
+falls off past the closing rank.
+"""
+import math
+
+import numpy as np
+
+# Default relative uncertainty (log-scale standard deviation) of a predicted category rank
+RANK_UNCERTAINTY = 0.1
+
+# Year-to-year spread of a closing rank: floor plus a share of the log opening-closing range
+CUTOFF_FLOOR = 0.05
+CUTOFF_SPREAD = 0.5
+
+# Lowest chance (in thousandths) of each band
+SAFE_PERMILLE = 750
+MODERATE_PERMILLE = 350
+
+
+def chance_band(permille: int) -> str:
+    if permille >= SAFE_PERMILLE:
+        return 'safe'
+    if permille >= MODERATE_PERMILLE:
+        return 'moderate'
+    return 'reach'
+
+
+# Opening of a result row (up to its "Closing Rank" key) for each chance in
+# thousandths; the keys sort first, so rows keep sorted keys
+ROW_PREFIXES = [
+    b'{"Admission Band":"%s","Admission Chance":%s,' % (chance_band(permille).encode(), repr(permille / 1000).encode())
+    for permille in range(1001)
+]
+
+
+def normal_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF, via the Abramowitz-Stegun 7.1.26 erf (error < 1.5e-7)."""
+    z = np.abs(x) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1 - poly * np.exp(-z * z)
+    return 0.5 * (1 + np.where(x < 0, -erf, erf))
+
+
+def cutoff_variance(opening_ranks: np.ndarray, closing_ranks: np.ndarray) -> tuple:
+    """(log closing ranks, variance of log closing rank) per program."""
+    log_closing = np.log(np.maximum(closing_ranks, 1))
+    log_opening = np.log(np.clip(opening_ranks, 1, np.maximum(closing_ranks, 1)))
+    # A missing opening rank counts as a single-seat program
+    log_opening = np.where(np.isnan(log_opening), log_closing, log_opening)
+    spread = CUTOFF_FLOOR + CUTOFF_SPREAD * (log_closing - log_opening)
+    return log_closing, spread * spread
+
+
+def _permille_thresholds() -> np.ndarray:
+    # z at which Phi(z) reaches (k - 0.5) / 1000, for k = 1..1000, by bisection
+    targets = (np.arange(1, 1001) - 0.5) / 1000
+    low, high = np.full(1000, -10.0), np.full(1000, 10.0)
+    for _ in range(60):
+        middle = (low + high) / 2
+        below = normal_cdf(middle) < targets
+        low, high = np.where(below, middle, low), np.where(below, high, middle)
+    return high
+
+
+# Phi(z) rounded to thousandths is the number of thresholds <= z
+PERMILLE_THRESHOLDS = _permille_thresholds()
+
+
+def admission_permille(log_closing: np.ndarray, variance: np.ndarray, category_rank: int,
+                       rank_uncertainty: float = RANK_UNCERTAINTY) -> np.ndarray:
+    """Chance of admission in thousandths (0-1000) for every program."""
+    # math.log of a float: no NumPy error for ints past int64, and the same
+    # value the Vercel /api/colleges function computes
+    log_rank = math.log(max(float(category_rank), 1.0))
+    z = (log_closing - log_rank) / np.sqrt(variance + rank_uncertainty * rank_uncertainty)
+    return np.searchsorted(PERMILLE_THRESHOLDS, z, side='right')
@@ -1,617 +1,328 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+import csv
+import functools
+import gzip
+import hashlib
+import io
+import json
 import math
-import pandas as pd
 import os
+import threading
+import zlib
+
+from lru_cache import college_cache
+from prediction import TOTAL_MARKS, predict_results, request_results
+from registry import Registry
+
+# pandas and NumPy are imported on first use, not here: /api/predict and
+# /api/health never need them (only /api/predict/batch and /api/colleges do),
+# so a worker can serve predictions before they are loaded
 
 app = Flask(__name__)
 CORS(app)
 
-# Constants
-TOTAL_MARKS = 300  # JEE Mains total marks
-a = -0.1035 #exponential coefficient
-b = 1500000 #number of test takers
-
-# ============================
-# Basic Conversion Functions
-# ============================
+# Models and JoSAA datasets by year/round (backend/registry.json), reloaded when
+# their files change; cached college lists are dropped on every swap. The
+# datasets are loaded by the first college request or by warm_up().
+registry = Registry(on_swap=college_cache.clear)
 
-def marks_to_percentage(score: int, total: int = TOTAL_MARKS) -> float:
-    return score * 100 / total
+# warm_up() loads the datasets in the background unless COLLEGE_WARM_UP=0
+WARM_UP = os.environ.get('COLLEGE_WARM_UP', '1') != '0'
 
-def percentage_to_marks(percentage: float, total: int = TOTAL_MARKS) -> int:
-    return math.floor(percentage * total / 100)
+def load_colleges():
+    """Load the JoSAA datasets and import the college list modules (pandas, NumPy)."""
+    import response_cache  # noqa: F401
+    registry.current(datasets=True)
 
-def percentage_to_percentile(percentage: float) -> float:
+def warm_up():
     """
-    Piecewise logistic model for percentage to percentile conversion.
-    - 0 to 25: Logistic function
-    - 25 to 40: Logarithmic function
-    - 40 and above: Exponential function
+    Start loading the college data in a daemon thread, for a server that is
+    already taking requests. A college request that arrives first waits for
+    the same load instead of starting another.
     """
-    if percentage <= 25:
-        # Logistic model
-        Lfit = -86.555129
-        Ufit = 98.24994
-        kfit = 0.153249
-        x0_fit = 0.624824
-        percentile = Lfit + (Ufit - Lfit) / (1 + math.exp(-kfit * (percentage - x0_fit)))
-    elif 25 < percentage <= 40:
-        # Logarithmic model
-        percentile = 65.1 + 8.95 * math.log(percentage)
-    else:  # percentage > 40
-        # Exponential model
-        percentile = 100 * (1 - math.exp(-0.095 * percentage))
-    return percentile
-
-# Calculate exact segment boundaries for inverse function
-PERCENTILE_AT_25 = -86.555129 + (98.24994 - (-86.555129)) / (1 + math.exp(-0.153249 * (25 - 0.624824)))  # ~94.417
-PERCENTILE_AT_40 = 65.1 + 8.95 * math.log(40)  # ~97.796
-
-def percentile_to_percentage(percentile: float) -> float:
-    """
-    Inverse of percentage_to_percentile using piecewise model.
-    Uses precise segment boundaries.
-    """
-    if percentile <= PERCENTILE_AT_25:
-        # Invert logistic model (segment 1: 0-25%)
-        # Using numerical search
-        low, high = 0, 25
-        for _ in range(50):  # Binary search
-            mid = (low + high) / 2
-            test_percentile = percentage_to_percentile(mid)
-            if abs(test_percentile - percentile) < 0.001:
-                return mid
-            if test_percentile < percentile:
-                low = mid
-            else:
-                high = mid
-        return (low + high) / 2
-
-    elif PERCENTILE_AT_25 < percentile <= PERCENTILE_AT_40:
-        # Invert logarithmic model (segment 2: 25-40%)
-        # percentile = 65.1 + 8.95 * ln(percentage)
-        # ln(percentage) = (percentile - 65.1) / 8.95
-        # percentage = exp((percentile - 65.1) / 8.95)
-        percentage = math.exp((percentile - 65.1) / 8.95)
-        return percentage
-
-    else:  # percentile > PERCENTILE_AT_40
-        # Invert exponential model (segment 3: 40+%)
-        # percentile = 100 * (1 - exp(-0.095 * percentage))
-        # 1 - percentile/100 = exp(-0.095 * percentage)
-        # ln(1 - percentile/100) = -0.095 * percentage
-        # percentage = -ln(1 - percentile/100) / 0.095
-        if percentile >= 100:
-            return 100
-        percentage = -math.log(1 - percentile / 100) / 0.095
-        return percentage
-
-def percentile_to_air(percentile: float) -> int:
-    return int(b * (1 - percentile / 100))
-
-def air_to_percentile(air: int) -> float:
-    return 100 * (1 - air / b)
+    if not WARM_UP:
+        return None
+    def run():
+        try:
+            load_colleges()
+        except Exception as e:
+            print(f"College warm-up failed, loading on first request instead: {e}")
+    thread = threading.Thread(target=run, name='college-warm-up', daemon=True)
+    thread.start()
+    return thread
 
 # ============================
-# Coefficient Declarations (SC)
+# API Endpoints
 # ============================
 
-F1_C1_M = 0.0251
-F1_C1_B = -19.5
-F1_C2_M = 0.0276
-F1_C2_B = -51.9
-F1_C3_M = 0.0383
-F1_C3_B = -373
-F1_C4_M = 0.0429
-F1_C4_B = -605
-F1_C5_M = 0.0515
-F1_C5_B = -1297
-F1_C6_M = 0.0571
-F1_C6_B = -1854
-F1_C7_M = 0.0738
-F1_C7_B = -4542
-F1_C8_M = 0.0892
-F1_C8_B = -9217
-F1_C9_M = 0.106
-F1_C9_B = -17937
-F1_C10_M = 0.118
-F1_C10_B = -30183
-
-# Function 2 coefficients (OBC-NCL)
-F2_C1_M = 0.232
-F2_C1_B = -131
-F2_C2_M = 0.313
-F2_C2_B = -1180
-F2_C3_M = 0.351
-F2_C3_B = -2833
-F2_C4_M = 0.389
-F2_C4_B = -7865
-
-# Function 3 coefficients (EWS)
-F3_C1_M = 0.129
-F3_C1_B = -77.2
-F3_C2_M = 0.145
-F3_C2_B = -100
-F3_C3_M = 0.118
-F3_C3_B = 7517
-F3_C4_M = 0.098
-F3_C4_B = 19862
-F3_C5_M = 0.0788
-F3_C5_B = 39286
-
-# Function 4 coefficients (ST)
-F4_C1_M = 0.00725
-F4_C1_B = -32.2
-F4_C2_M = 0.0122
-F4_C2_B = -326
-F4_C3_M = 0.0165
-F4_C3_B = -930
-F4_C4_M_LINEAR = 0.0136
-F4_C4_M_QUAD = 1.76e-8
-F4_C4_B = -1146
-F4_C5_M = 0.0396
-F4_C5_B = -11081
-
-# ST segment coefficients for inverse
-C4_S1_A = F4_C1_M
-C4_S1_B = F4_C1_B
-C4_S2_A = F4_C2_M
-C4_S2_B = F4_C2_B
-C4_S3_A = F4_C3_M
-C4_S3_B = F4_C3_B
-C4_S4_A = F4_C4_M_QUAD
-C4_S4_B = F4_C4_M_LINEAR
-C4_S4_C = F4_C4_B
-C4_S5_A = F4_C5_M
-C4_S5_B = F4_C5_B
-
-# ============================
-# Inverse Coefficients
-# ============================
+def predict_request(data: dict) -> dict:
+    """
+    Results for one /api/predict request body (prediction.request_results with
+    the registry's model for its "year"). Raises for invalid input.
+    """
+    return request_results(data, registry.current().model(data.get('year')))
 
-# OBC-NCL
-INV1_C1_M = 0.232
-INV1_C1_B = 131
-INV1_C2_M = 0.313
-INV1_C2_B = 1180
-INV1_C3_M = 0.351
-INV1_C3_B = 2833
-INV1_C4_M = 0.389
-INV1_C4_B = 7865
-
-# EWS
-INV2_C1_M = 0.129
-INV2_C1_B = 77.2
-INV2_C2_M = 0.145
-INV2_C2_B = 100
-INV2_C3_M = 0.118
-INV2_C3_B = -7517
-INV2_C4_M = 0.098
-INV2_C4_B = -19862
-INV2_C5_M = 0.0788
-INV2_C5_B = -39286
-
-# SC
-INV4_C1_M = 0.0251
-INV4_C1_B = 19.5
-INV4_C2_M = 0.0276
-INV4_C2_B = 51.9
-INV4_C3_M = 0.0383
-INV4_C3_B = 373
-INV4_C4_M = 0.0429
-INV4_C4_B = 605
-INV4_C5_M = 0.0515
-INV4_C5_B = 1297
-INV4_C6_M = 0.0571
-INV4_C6_B = 1854
-INV4_C7_M = 0.0738
-INV4_C7_B = 4542
-INV4_C8_M = 0.0892
-INV4_C8_B = 9217
-INV4_C9_M = 0.106
-INV4_C9_B = 17937
-INV4_C10_M = 0.118
-INV4_C10_B = 30183
+@app.route('/api/predict', methods=['POST'])
+def predict():
+    try:
+        results = predict_request(request.json)
+        return jsonify({'success': True, 'results': results})
 
-# ============================
-# AIR to Category Rank Functions
-# ============================
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
 
-def calculate_function1(value: float) -> float:
-    """SC category"""
-    if value < 10000:
-        return F1_C1_M * value + F1_C1_B
-    elif 10000 <= value <= 30000:
-        return F1_C2_M * value + F1_C2_B
-    elif 30000 <= value <= 50000:
-        return F1_C3_M * value + F1_C3_B
-    elif 50000 <= value <= 75000:
-        return F1_C4_M * value + F1_C4_B
-    elif 75000 <= value <= 100000:
-        return F1_C5_M * value + F1_C5_B
-    elif 100000 <= value <= 150000:
-        return F1_C6_M * value + F1_C6_B
-    elif 150000 <= value <= 300000:
-        return F1_C7_M * value + F1_C7_B
-    elif 300000 <= value <= 500000:
-        return F1_C8_M * value + F1_C8_B
-    elif 500000 <= value <= 1000000:
-        return F1_C9_M * value + F1_C9_B
-    elif value > 1000000:
-        return F1_C10_M * value + F1_C10_B
-    return 0.0
-
-def calculate_function2(value: float) -> float:
-    """OBC-NCL category"""
-    if value < 10000:
-        return F2_C1_M * value + F2_C1_B
-    elif 10000 <= value <= 50000:
-        return F2_C2_M * value + F2_C2_B
-    elif 50000 <= value <= 100000:
-        return F2_C3_M * value + F2_C3_B
-    elif value > 100000:
-        return F2_C4_M * value + F2_C4_B
-    return 0.0
-
-def calculate_function3(value: float) -> float:
-    """EWS category"""
-    if value <= 10000:
-        return F3_C1_M * value + F3_C1_B
-    elif 10000 < value <= 300000:
-        return F3_C2_M * value + F3_C2_B
-    elif 300000 < value <= 600000:
-        return F3_C3_M * value + F3_C3_B
-    elif 600000 < value <= 1000000:
-        return F3_C4_M * value + F3_C4_B
-    elif value > 1000000:
-        return F3_C5_M * value + F3_C5_B
-    return 0.0
-
-def calculate_function4(value: float) -> float:
-    """ST category"""
-    if value <= 50000:
-        return F4_C1_M * value + F4_C1_B
-    elif 50000 < value <= 150000:
-        return F4_C2_M * value + F4_C2_B
-    elif 150000 < value <= 200000:
-        return F4_C3_M * value + F4_C3_B
-    elif 200000 < value <= 750000:
-        return F4_C4_M_QUAD * (value ** 2) + F4_C4_M_LINEAR * value + F4_C4_B
-    elif value > 750000:
-        return F4_C5_B + F4_C5_M * value
-    return 0.0
-
-def air_to_cat(category: str, rank: float) -> int:
-    """Convert All India Rank to Category Rank"""
-    if category == "SC":
-        raw = calculate_function1(rank)
-    elif category == "OBC-NCL":
-        raw = calculate_function2(rank)
-    elif category == "EWS":
-        raw = calculate_function3(rank)
-    elif category == "OPEN":
-        raw = rank
-    elif category == "ST":
-        raw = calculate_function4(rank)
-    else:
-        raise ValueError("Invalid category")
+@functools.lru_cache(maxsize=8)
+def marks_table_document(model) -> tuple:
+    """(JSON body, ETag) of a model's whole marks -> results table for every category."""
+    body = json.dumps({
+        'success': True,
+        'totalMarks': TOTAL_MARKS,
+        'table': {
+            category: {
+                field: [row[field] for row in rows]
+                for field in ['percentage', 'percentile', 'allIndiaRank', 'categoryRank']
+            }
+            for category, rows in model.marks_table.items()
+        },
+    }, sort_keys=True, separators=(',', ':'))
+    return body, hashlib.sha1(body.encode()).hexdigest()
+
+@app.route('/api/predict/table', methods=['GET'])
+def predict_table():
+    try:
+        body, etag = marks_table_document(registry.current().model(request.args.get('year')))
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
 
-    rounded = int(round(raw))
-    if rounded <= 0:
-        return 1
-    return rounded
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Revalidate every time (a 304 while the ETag matches): the registry can
+    # swap the model in at any poll
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
-# ============================
-# Category Rank to AIR Functions
-# ============================
+# Largest number of records accepted by /api/predict/batch
+MAX_BATCH_SIZE = 200000
 
-def inverse_function1(y: float) -> float:
-    """OBC-NCL inverse"""
-    if y < 2189:
-        return (y + INV1_C1_B) / INV1_C1_M
-    elif 2189 <= y <= 14470:
-        return (y + INV1_C2_B) / INV1_C2_M
-    elif 14470 <= y <= 32267:
-        return (y + INV1_C3_B) / INV1_C3_M
-    elif y > 32267:
-        return (y + INV1_C4_B) / INV1_C4_M
-    return 0.0
-
-def inverse_function2(y: float) -> float:
-    """EWS inverse"""
-    if y <= 1212.8:
-        return (y + INV2_C1_B) / INV2_C1_M
-    elif 1212.8 < y <= 43400:
-        return (y + INV2_C2_B) / INV2_C2_M
-    elif 43400 < y <= 78317:
-        return (y + INV2_C3_B) / INV2_C3_M
-    elif 78317 < y <= 117862:
-        return (y + INV2_C4_B) / INV2_C4_M
-    elif y > 117862:
-        return (y + INV2_C5_B) / INV2_C5_M
-    return 0.0
-
-def inverse_function3(y: float) -> int:
-    """ST inverse - from notebook"""
-    # Determine y-ranges of each segment
-    y_s1_min = calculate_function4(0.0)
-    y_s1_max = calculate_function4(50000.0)
-    y_s2_min = calculate_function4(50000.0)
-    y_s2_max = calculate_function4(150000.0)
-    y_s3_min = calculate_function4(150000.0)
-    y_s3_max = calculate_function4(200000.0)
-    y_s4_min = calculate_function4(200000.0)
-    y_s4_max = calculate_function4(750000.0)
-    y_s5_min = calculate_function4(750000.0)
-
-    # Invert per segment by y-range
-    if y_s1_min <= y <= y_s1_max:
-        x = (y - C4_S1_B) / C4_S1_A
-    elif y_s2_min < y <= y_s2_max:
-        x = (y - C4_S2_B) / C4_S2_A
-    elif y_s3_min < y <= y_s3_max:
-        x = (y - C4_S3_B) / C4_S3_A
-    elif y_s4_min < y <= y_s4_max:
-        # Solve: C4_S4_A * x^2 + C4_S4_B * x + (C4_S4_C - y) = 0
-        a = C4_S4_A
-        b = C4_S4_B
-        c = C4_S4_C - y
-        disc = b * b - 4.0 * a * c
-        if disc < 0:
-            raise ValueError("No real solution for quadratic inverse in segment 4")
-        sqrt_disc = math.sqrt(disc)
-        x1 = (-b + sqrt_disc) / (2.0 * a)
-        x2 = (-b - sqrt_disc) / (2.0 * a)
-        # Select the root that lies in (200000, 750000]
-        x = None
-        for candidate in (x1, x2):
-            if 200000.0 < candidate <= 750000.0:
-                x = candidate
-                break
-        if x is None:
-            raise ValueError("No valid root in the domain (200000, 750000] for segment 4")
-    elif y > y_s5_min:
-        x = (y - C4_S5_B) / C4_S5_A
-        if x <= 750000.0:
-            raise ValueError("Inverse in segment 5 produced x not > 750000")
-    else:
-        raise ValueError("Input y is outside the range of calculate_function4")
-
-    rounded = int(round(x))
-    if rounded <= 0:
-        return 1
-    return rounded
-
-def inverse_function4(y: float) -> float:
-    """SC inverse"""
-    if y < 231.6:
-        return (y + INV4_C1_B) / INV4_C1_M
-    elif 231.6 <= y <= 776.1:
-        return (y + INV4_C2_B) / INV4_C2_M
-    elif 776.1 <= y <= 1542:
-        return (y + INV4_C3_B) / INV4_C3_M
-    elif 1542 <= y <= 2612.5:
-        return (y + INV4_C4_B) / INV4_C4_M
-    elif 2612.5 <= y <= 3853:
-        return (y + INV4_C5_B) / INV4_C5_M
-    elif 3853 <= y <= 6711:
-        return (y + INV4_C6_B) / INV4_C6_M
-    elif 6711 <= y <= 17598:
-        return (y + INV4_C7_B) / INV4_C7_M
-    elif 17598 <= y <= 35483:
-        return (y + INV4_C8_B) / INV4_C8_M
-    elif 35483 <= y <= 88063:
-        return (y + INV4_C9_B) / INV4_C9_M
-    elif y > 88063:
-        return (y + INV4_C10_B) / INV4_C10_M
-    return 0.0
-
-def cat_to_air(category: str, rank: float) -> int:
-    """Convert Category Rank to All India Rank"""
-    if category == "SC":
-        raw = inverse_function4(rank)
-    elif category == "OBC-NCL":
-        raw = inverse_function1(rank)
-    elif category == "EWS":
-        raw = inverse_function2(rank)
-    elif category == "OPEN":
-        raw = rank
-    elif category == "ST":
-        raw = inverse_function3(rank)
-    else:
-        raise ValueError("Invalid category")
+# One successful /api/predict/batch entry, keys sorted like jsonify
+BATCH_RESULT_JSON = ('{"results":{"allIndiaRank":%d,"categoryRank":%d,"marks":%d,'
+                     '"percentage":%r,"percentile":%r},"success":true}')
+VECTORIZED_INPUT_TYPES = {'marks', 'percentage', 'percentile', 'allIndiaRank', 'categoryRank'}
 
-    rounded = int(round(raw))
-    if rounded < 0:
-        return 1
-    return rounded
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/x-jsonlines')
 
-# ============================
-# API Endpoints
-# ============================
+def read_batch_records() -> list:
+    """
+    Records for /api/predict/batch from a JSON array (or {"records": [...]}),
+    a CSV or NDJSON body, or a CSV/NDJSON file uploaded as form field "file".
+    NDJSON lines that are not valid JSON are kept as error strings.
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        text = upload.read().decode('utf-8-sig')
+        is_csv = upload.filename.lower().endswith('.csv') or upload.mimetype == 'text/csv'
+    elif request.mimetype == 'text/csv' or request.mimetype in NDJSON_MIMETYPES:
+        text = request.get_data(as_text=True)
+        is_csv = request.mimetype == 'text/csv'
+    else:
+        data = request.get_json()
+        if isinstance(data, dict):
+            data = data.get('records')
+        if not isinstance(data, list):
+            raise ValueError("Expected a JSON array of records or {\"records\": [...]}")
+        return data
+
+    if is_csv:
+        return list(csv.DictReader(io.StringIO(text)))
+
+    records = []
+    for line in text.splitlines():
+        if line.strip():
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                records.append(f"Invalid JSON line: {e}")
+    return records
+
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    import numpy as np
+    import vectorized
 
-@app.route('/api/predict', methods=['POST'])
-def predict():
     try:
-        data = request.json
-        category = data.get('category')
-        input_type = data.get('inputType')
-        input_value = float(data.get('inputValue'))
-
-        # Initialize results
-        results = {
-            'marks': None,
-            'percentage': None,
-            'percentile': None,
-            'allIndiaRank': None,
-            'categoryRank': None
-        }
-
-        # Based on input type, calculate all other values
-        if input_type == 'marks':
-            # Handle negative marks - treat as 0
-            input_value = max(0, input_value)
-            results['marks'] = int(input_value)
-
-            # Edge case: 300 marks = 100 percentile, AIR = 1
-            if input_value >= 300:
-                results['marks'] = 300
-                results['percentage'] = 100.0
-                results['percentile'] = 100.0
-                results['allIndiaRank'] = 1
-                results['categoryRank'] = 1
-            else:
-                results['percentage'] = round(marks_to_percentage(input_value), 2)
-                results['percentile'] = round(percentage_to_percentile(results['percentage']), 5)
-                results['allIndiaRank'] = percentile_to_air(results['percentile'])
-                results['categoryRank'] = air_to_cat(category, results['allIndiaRank'])
-
-        elif input_type == 'percentage':
-            # Edge case: 100 percentage = 100 percentile, AIR = 1
-            if input_value >= 100:
-                results['percentage'] = 100.0
-                results['marks'] = 300
-                results['percentile'] = 100.0
-                results['allIndiaRank'] = 1
-                results['categoryRank'] = 1
-            else:
-                results['percentage'] = round(input_value, 2)
-                results['marks'] = percentage_to_marks(input_value)
-                results['percentile'] = round(percentage_to_percentile(input_value), 5)
-                results['allIndiaRank'] = percentile_to_air(results['percentile'])
-                results['categoryRank'] = air_to_cat(category, results['allIndiaRank'])
-
-        elif input_type == 'percentile':
-            results['percentile'] = round(input_value, 5)
-            results['percentage'] = round(percentile_to_percentage(input_value), 2)
-            results['marks'] = percentage_to_marks(results['percentage'])
-            results['allIndiaRank'] = percentile_to_air(input_value)
-            results['categoryRank'] = air_to_cat(category, results['allIndiaRank'])
-
-        elif input_type == 'allIndiaRank':
-            results['allIndiaRank'] = int(input_value)
-            results['percentile'] = round(air_to_percentile(int(input_value)), 5)
-            results['percentage'] = round(percentile_to_percentage(results['percentile']), 2)
-            results['marks'] = percentage_to_marks(results['percentage'])
-            results['categoryRank'] = air_to_cat(category, int(input_value))
-
-        elif input_type == 'categoryRank':
-            results['categoryRank'] = int(input_value)
-            results['allIndiaRank'] = cat_to_air(category, int(input_value))
-            results['percentile'] = round(air_to_percentile(results['allIndiaRank']), 5)
-            results['percentage'] = round(percentile_to_percentage(results['percentile']), 2)
-            results['marks'] = percentage_to_marks(results['percentage'])
-
-        return jsonify({'success': True, 'results': results})
+        model = registry.current().model(request.args.get('year'))
+        records = read_batch_records()
+        if len(records) > MAX_BATCH_SIZE:
+            raise ValueError(f"Batch too large: {len(records)} records (max {MAX_BATCH_SIZE})")
+
+        # Valid records are grouped by (category, inputType) and converted with
+        # the NumPy versions of the conversion chain; anything unusual (bad
+        # category or input type, non-finite values) takes the scalar path.
+        # Each entry is serialized straight to JSON (same output as jsonify).
+        results = [None] * len(records)
+        errors = 0
+        groups = {(category, input_type): ([], []) for category in ['OPEN', *model.category_models]
+                  for input_type in VECTORIZED_INPUT_TYPES}
+        for position, record in enumerate(records):
+            try:
+                if not isinstance(record, dict):
+                    raise ValueError(record if isinstance(record, str) else "Record must be an object")
+                category = record.get('category')
+                input_type = record.get('inputType')
+                input_value = float(record.get('inputValue'))
+                if isinstance(category, str) and isinstance(input_type, str) and -1e15 < input_value < 1e15:
+                    group = groups.get((category, input_type))
+                    if group is not None:
+                        group[0].append(position)
+                        group[1].append(input_value)
+                        continue
+                result = {'success': True, 'results': predict_results(category, input_type, input_value, model)}
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+                errors += 1
+            results[position] = json.dumps(result, sort_keys=True, separators=(',', ':'))
+
+        fields = ['allIndiaRank', 'categoryRank', 'marks', 'percentage', 'percentile']
+        for (category, input_type), (positions, values) in groups.items():
+            if not positions:
+                continue
+            arrays = vectorized.predict_results(category, input_type, np.array(values), model)
+            entries = map(BATCH_RESULT_JSON.__mod__, zip(*(arrays[field].tolist() for field in fields)))
+            for position, entry in zip(positions, entries):
+                results[position] = entry
+            # Rare: let the scalar chain give its own result or error where the arrays have none
+            for i in np.flatnonzero(~arrays['valid']).tolist():
+                try:
+                    result = {'success': True,
+                              'results': predict_results(category, input_type, values[i], model)}
+                except Exception as e:
+                    result = {'success': False, 'error': str(e)}
+                    errors += 1
+                results[positions[i]] = json.dumps(result, sort_keys=True, separators=(',', ':'))
+
+        body = '{"count":%d,"errors":%d,"results":[%s],"success":true}' % (len(results), errors, ','.join(results))
+        return app.response_class(body, mimetype='application/json')
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+# /api/colleges response compression: bodies from this size, for clients
+# sending Accept-Encoding: gzip
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+
+# Rows per chunk of a streamed NDJSON /api/colleges response
+NDJSON_CHUNK_ROWS = 100
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    for coding in accept_encoding.lower().split(','):
+        name, _, params = coding.partition(';')
+        if name.strip() in ('gzip', '*') and params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            return True
+    return False
+
+def wants_ndjson(accept: str, data) -> bool:
+    """NDJSON streaming, asked for with Accept: application/x-ndjson or "format": "ndjson"."""
+    return 'application/x-ndjson' in accept or (isinstance(data, dict) and data.get('format') == 'ndjson')
+
+def gzip_chunks(chunks):
+    """Gzip a stream, flushing after every chunk so each one reaches the client at once."""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+def college_list(data: dict) -> tuple:
+    """
+    (CollegeIndex, CollegeList) for a request's dataset (year, round) and
+    candidate (category, gender, state). The rank-independent list is served
+    from the LRU cache.
+    """
+    from response_cache import CollegeList
+
+    category, gender, state = data.get('category'), data.get('gender'), data.get('state')
+    dataset_key, index = registry.current(datasets=True).dataset(data.get('year'), data.get('round'))
+    bucket_key = index.bucket_key(category, gender, state)
+    if bucket_key not in index.buckets:
+        # Not a seat type: every such request shares one empty list, so
+        # arbitrary category strings cannot fill the cache
+        bucket_key = None
+    colleges = college_cache.get_or_build(
+        (dataset_key, bucket_key),
+        lambda: CollegeList(index.bucket(category, gender, state)),
+    )
+    return index, colleges
+
+def colleges_request(data: dict, stream: bool = False):
+    """
+    Response body for one /api/colleges request body: JSON bytes, or an
+    iterator of NDJSON chunks (one college per line) when stream is set.
+    Raises for invalid input.
+    """
+    from admission_chance import RANK_UNCERTAINTY
+    from college_filters import CollegeQuery
+    from college_index import DEFAULT_RANK_MARGIN
+
+    print(f"Received request: {data}")
+    category = data.get('category')
+    category_rank = int(data.get('categoryRank'))
+    gender = data.get('gender')
+    state = data.get('state')
+    print(f"Parsed: category={category}, rank={category_rank}, gender={gender}, state={state}")
+
+    # Rank tolerance: Closing Rank >= rankMargin * category rank (default 10% error margin)
+    margin = float(data.get('rankMargin', DEFAULT_RANK_MARGIN))
+    if not margin > 0:
+        raise ValueError("rankMargin must be positive")
+
+    # Log-scale standard deviation of the category rank, for the admission chances
+    rank_uncertainty = float(data.get('rankUncertainty', RANK_UNCERTAINTY))
+    if not rank_uncertainty >= 0:
+        raise ValueError("rankUncertainty must not be negative")
+
+    # Optional page: `limit` eligible rows starting `offset` rows in
+    paginated = 'offset' in data or 'limit' in data
+    offset = int(data.get('offset', 0))
+    limit = data.get('limit')
+    limit = None if limit is None else int(limit)
+    if offset < 0:
+        raise ValueError("offset must not be negative")
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be positive")
+
+    # Rank-independent result list for this dataset, seat type, gender pool and
+    # home state, sliced by rank
+    index, colleges = college_list(data)
+
+    # Optional filters, search, sort order and facet counts
+    query = CollegeQuery.from_request(data, index.search)
+    selection = colleges.select(category_rank, margin, offset, limit, query)
+    print(f"Returning {selection[1]} colleges")
+
+    if stream:
+        return colleges.ndjson_chunks(category_rank, selection[0], NDJSON_CHUNK_ROWS, rank_uncertainty)
+    return colleges.response_body(category_rank, margin, selection, offset, paginated, query, rank_uncertainty)
+
 @app.route('/api/colleges', methods=['POST'])
 def get_colleges():
     try:
         data = request.json
-        print(f"Received request: {data}")
-        category = data.get('category')
-        category_rank = int(data.get('categoryRank'))
-        gender = data.get('gender')
-        state = data.get('state')
-        print(f"Parsed: category={category}, rank={category_rank}, gender={gender}, state={state}")
-
-        # Load CSV file - works for both local and Vercel
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        csv_path = os.path.join(current_dir, '..', 'College Databases - JoSAA 2024.csv')
-        csv_path = os.path.abspath(csv_path)
-        df = pd.read_csv(csv_path)
-
-        # Filter by Entrance Test = JEE Main
-        df = df[df['Entrance Test'] == 'JEE Main']
-
-        # Filter by Seat Type = category
-        df = df[df['Seat Type'] == category]
-
-        # Filter by Gender
-        if gender == 'Male':
-            # Only Gender-Neutral
-            df = df[df['Gender'] == 'Gender-Neutral']
-        else:  # Female
-            # For each College ID, check if Female-only rows exist
-            college_ids = df['College ID'].unique()
-            filtered_dfs = []
-
-            for college_id in college_ids:
-                college_df = df[df['College ID'] == college_id]
-                female_only_df = college_df[college_df['Gender'].str.contains('Female-only', na=False)]
-
-                if len(female_only_df) > 0:
-                    # Show only Female-only rows for this college
-                    filtered_dfs.append(female_only_df)
-                else:
-                    # Show all eligible rows for this college
-                    filtered_dfs.append(college_df)
-
-            if filtered_dfs:
-                df = pd.concat(filtered_dfs, ignore_index=True)
-            else:
-                df = pd.DataFrame()  # Empty dataframe
-
-        # Filter by State and Quota
-        college_ids = df['College ID'].unique()
-        filtered_dfs = []
-
-        for college_id in college_ids:
-            college_df = df[df['College ID'] == college_id]
-            college_state = college_df['State'].iloc[0] if len(college_df) > 0 else None
-
-            if college_state == state:
-                # Home state - show HS or AI quota
-                quota_filter = college_df['Quota'].isin(['HS', 'AI'])
-
-                # Special cases
-                if state == 'Goa':
-                    quota_filter = college_df['Quota'].isin(['HS', 'AI', 'GO'])
-                elif state == 'Jammu and Kashmir':
-                    quota_filter = college_df['Quota'].isin(['HS', 'AI', 'JK', 'LA'])
-
-                filtered_college_df = college_df[quota_filter]
-            else:
-                # Other state - show OS or AI quota
-                filtered_college_df = college_df[college_df['Quota'].isin(['OS', 'AI'])]
-
-            if len(filtered_college_df) > 0:
-                filtered_dfs.append(filtered_college_df)
-
-        if filtered_dfs:
-            df = pd.concat(filtered_dfs, ignore_index=True)
-        else:
-            df = pd.DataFrame()
-
-        # Convert Closing Rank and Expected Salary to numeric
-        df['Closing Rank'] = pd.to_numeric(df['Closing Rank'], errors='coerce')
-        df['Expected Salary'] = pd.to_numeric(df['Expected Salary'], errors='coerce')
-        df = df.dropna(subset=['Closing Rank'])  # Remove rows with invalid closing ranks
-
-        # Filter by Closing Rank >= 0.9 * category_rank (10% error margin)
-        df = df[df['Closing Rank'] >= 0.9 * category_rank]
-
-        # Select and rename columns
-        result_df = df[['Institute', 'Academic Program Name', 'State', 'Closing Rank', 'Expected Salary']].copy()
-        result_df = result_df.sort_values(by='Closing Rank')
-        result_df.columns = ['College', 'Course', 'State', 'Closing Rank', 'Expected Salary as per NIRF']
-
-        # Convert to list of dictionaries
-        results = result_df.to_dict('records')
-
-        # Replace NaN with None in the dictionaries (pandas 3.0 compatibility)
-        import math
-        for record in results:
-            for key, value in record.items():
-                if isinstance(value, float) and math.isnan(value):
-                    record[key] = None
-        print(f"Returning {len(results)} colleges")
+        stream = wants_ndjson(request.headers.get('Accept', ''), data)
+        body = colleges_request(data, stream)
+        compress = accepts_gzip(request.headers.get('Accept-Encoding', ''))
 
-        return jsonify({'success': True, 'colleges': results})
+        if stream:
+            response = app.response_class(gzip_chunks(body) if compress else body, mimetype='application/x-ndjson')
+        else:
+            compress = compress and len(body) >= GZIP_MIN_BYTES
+            response = app.response_class(gzip.compress(body, GZIP_LEVEL, mtime=0) if compress else body,
+                                          mimetype='application/json')
+        if compress:
+            response.headers['Content-Encoding'] = 'gzip'
+            response.vary.add('Accept-Encoding')
+        return response
 
     except Exception as e:
         print(f"ERROR in get_colleges: {str(e)}")
@@ -619,9 +330,141 @@ def get_colleges():
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 400
 
+# Default /api/colleges/curve rank grid: minRank, maxRank, step
+CURVE_MIN_RANK = 1
+CURVE_MAX_RANK = 200000
+CURVE_STEP = 1000
+# Largest number of ranks in one curve
+MAX_CURVE_POINTS = 200001
+
+def curve_rank(value) -> int:
+    """One rank of a curve grid; ranks must be finite and not negative."""
+    rank = float(value)
+    if not math.isfinite(rank) or rank < 0:
+        raise ValueError(f"Ranks must be finite and not negative: {value}")
+    return int(value)
+
+def curve_ranks(data: dict) -> list:
+    """The rank grid of a curve request: "ranks", or minRank to maxRank every step."""
+    ranks = data.get('ranks')
+    if ranks is not None:
+        if not isinstance(ranks, list) or not ranks:
+            raise ValueError("ranks must be a non-empty list")
+        if len(ranks) > MAX_CURVE_POINTS:
+            raise ValueError(f"Too many ranks: {len(ranks)} (max {MAX_CURVE_POINTS})")
+        return [curve_rank(rank) for rank in ranks]
+
+    min_rank = curve_rank(data.get('minRank', CURVE_MIN_RANK))
+    max_rank = curve_rank(data.get('maxRank', CURVE_MAX_RANK))
+    step = int(data.get('step', CURVE_STEP))
+    if step < 1:
+        raise ValueError("step must be positive")
+    if max_rank < min_rank:
+        raise ValueError("maxRank must not be below minRank")
+    if (max_rank - min_rank) // step + 1 > MAX_CURVE_POINTS:
+        min_step = (max_rank - min_rank) // (MAX_CURVE_POINTS - 1) + 1
+        raise ValueError(f"Too many ranks: use a step of at least {min_step}")
+    return list(range(min_rank, max_rank + 1, step))
+
+def curve_request(data: dict) -> bytes:
+    """
+    JSON body for one /api/colleges/curve request: eligible rows and programs
+    for a candidate at every rank of a grid, optionally per value of groupBy
+    (a facet field) and narrowed by the /api/colleges filters. Raises for
+    invalid input.
+    """
+    from college_filters import FACETS, CollegeQuery
+    from college_index import DEFAULT_RANK_MARGIN
+
+    ranks = curve_ranks(data)
+    margin = float(data.get('rankMargin', DEFAULT_RANK_MARGIN))
+    if not margin > 0:
+        raise ValueError("rankMargin must be positive")
+    group_by = data.get('groupBy')
+    if group_by is not None and group_by not in FACETS:
+        raise ValueError(f"groupBy must be one of {', '.join(FACETS)}")
+
+    index, colleges = college_list(data)
+    curve = colleges.curve(ranks, margin, CollegeQuery.from_request(data, index.search), group_by)
+    curve.update(success=True, ranks=ranks, groupBy=group_by)
+    return json.dumps(curve, sort_keys=True, separators=(',', ':')).encode()
+
+@app.route('/api/colleges/curve', methods=['POST'])
+def colleges_curve():
+    try:
+        body = curve_request(request.json)
+        if accepts_gzip(request.headers.get('Accept-Encoding', '')) and len(body) >= GZIP_MIN_BYTES:
+            response = app.response_class(gzip.compress(body, GZIP_LEVEL, mtime=0), mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+            response.vary.add('Accept-Encoding')
+            return response
+        return app.response_class(body, mimetype='application/json')
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+# Largest number of "targets" in one /api/cutoff request
+MAX_CUTOFF_TARGETS = 1000
+
+def cutoff_request(data: dict) -> dict:
+    """
+    Response for one /api/cutoff request body: the closing rank a candidate
+    (category, gender, state) needs for one program (collegeId or institute,
+    and program), or for each entry of "targets", with the AIR, percentile,
+    percentage and marks it corresponds to. Raises for invalid input.
+    """
+    category = data.get('category')
+    if not isinstance(category, str):
+        raise ValueError("category is required")
+    gender = data.get('gender')
+    state = data.get('state')
+
+    snapshot = registry.current(datasets=True)
+    model = snapshot.model(data.get('year'))
+    _, index = snapshot.dataset(data.get('year'), data.get('round'))
+
+    def cutoff(target: dict) -> dict:
+        result = index.cutoffs.cutoff(target, category, gender, state)
+        # JEE Main closing ranks are category ranks of the conversion model;
+        # JEE Advanced ranks are not, so they are not converted
+        if result['entranceTest'] == 'JEE Main' and model.has_category(category):
+            result['required'] = predict_results(category, 'categoryRank', result['closingRank'], model)
+        else:
+            result['required'] = None
+        return result
+
+    targets = data.get('targets')
+    if targets is None:
+        return {'success': True, 'cutoff': cutoff(data)}
+    if not isinstance(targets, list):
+        raise ValueError("targets must be a list")
+    if len(targets) > MAX_CUTOFF_TARGETS:
+        raise ValueError(f"Too many targets: {len(targets)} (max {MAX_CUTOFF_TARGETS})")
+
+    results = []
+    errors = 0
+    for target in targets:
+        try:
+            if not isinstance(target, dict):
+                raise ValueError("Target must be an object")
+            results.append({'success': True, 'cutoff': cutoff(target)})
+        except Exception as e:
+            results.append({'success': False, 'error': str(e)})
+            errors += 1
+    return {'success': True, 'count': len(results), 'errors': errors, 'results': results}
+
+@app.route('/api/cutoff', methods=['POST'])
+def cutoff():
+    try:
+        return jsonify(cutoff_request(request.json))
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+def health_status() -> dict:
+    return {'status': 'ok', 'collegeCache': college_cache.stats(), 'registry': registry.current().stats()}
+
 @app.route('/api/health', methods=['GET'])
 def health():
-    return jsonify({'status': 'ok'})
+    return jsonify(health_status())
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', debug=True, port=5001, use_reloader=False)
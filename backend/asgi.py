@@ -0,0 +1,206 @@
+"""
+ASGI entry point for the backend, to serve it from an event loop under uvicorn:
+
+    uvicorn --app-dir backend asgi:app --host 0.0.0.0 --port 5001 --workers 2
+
+A slow client then only holds a connection on the loop, not a worker.
+/api/predict and /api/health are answered on the loop: both are a table
+lookup or a few arithmetic conversions. Predictions with intervals (a Monte
+Carlo pass, and NumPy imported on first use) and /api/colleges (which can
+build and serialize a college list) run in a bounded thread pool
+(ASGI_POOL_THREADS) and never block the loop. Everything else is handed to the Flask app in app.py in
+the same pool: CORS preflights, other routes, bodies that are not JSON, and
+streamed NDJSON college lists, which are sent chunk by chunk.
+Responses are the same as the Flask app's.
+"""
+import asyncio
+import gzip
+import io
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import app as backend
+
+# Threads for college lists and routes served by the Flask app
+POOL_THREADS = int(os.environ.get('ASGI_POOL_THREADS', 4))
+
+executor = ThreadPoolExecutor(max_workers=POOL_THREADS, thread_name_prefix='asgi-pool')
+
+
+def _json_body(value) -> bytes:
+    # Same bytes as Flask's jsonify
+    return (json.dumps(value, sort_keys=True, separators=(',', ':')) + '\n').encode()
+
+
+def _is_json(content_type: str) -> bool:
+    mimetype = content_type.split(';', 1)[0].strip().lower()
+    return mimetype == 'application/json' or (mimetype.startswith('application/') and mimetype.endswith('+json'))
+
+
+def _colleges(data, accept_encoding: str) -> tuple:
+    try:
+        body = backend.colleges_request(data)
+    except Exception as e:
+        print(f"ERROR in get_colleges: {str(e)}")
+        traceback.print_exc()
+        return 400, _json_body({'success': False, 'error': str(e)}), []
+    if backend.accepts_gzip(accept_encoding) and len(body) >= backend.GZIP_MIN_BYTES:
+        body = gzip.compress(body, backend.GZIP_LEVEL, mtime=0)
+        return 200, body, [('Content-Encoding', 'gzip'), ('Vary', 'Accept-Encoding')]
+    return 200, body, []
+
+
+def _predict(data) -> tuple:
+    try:
+        return 200, _json_body({'success': True, 'results': backend.predict_request(data)}), []
+    except Exception as e:
+        return 400, _json_body({'success': False, 'error': str(e)}), []
+
+
+def _call_flask(scope: dict, body: bytes) -> tuple:
+    """
+    Start the Flask app on one request (WSGI). Returns (status, headers, body
+    iterable); streamed bodies are produced as the iterable is consumed.
+    """
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+        'CONTENT_LENGTH': str(len(body)),
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':
+            key = f'HTTP_{name}'
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = headers
+
+    chunks = backend.app(environ, start_response)
+    return response['status'], response['headers'], chunks
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+
+async def _send(send, status: int, headers: list, body: bytes):
+    await _start(send, status, headers)
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _start(send, status: int, headers: list):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+    })
+
+
+async def _send_flask_response(send, loop, scope: dict, body: bytes):
+    status, headers, chunks = await loop.run_in_executor(executor, _call_flask, scope, body)
+    await _start(send, status, headers)
+    # Pull each chunk in the pool: streamed chunks are built (and gzipped) as they are read
+    iterator = iter(chunks)
+    try:
+        while True:
+            chunk = await loop.run_in_executor(executor, next, iterator, None)
+            if chunk is None:
+                break
+            if chunk:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            # Load the models before taking requests, off the loop; the
+            # datasets follow in the background once requests are served
+            try:
+                await asyncio.get_running_loop().run_in_executor(executor, backend.registry.current)
+            except Exception as e:
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+            backend.warm_up()
+        elif message['type'] == 'lifespan.shutdown':
+            executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await _lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    loop = asyncio.get_running_loop()
+    body = await _read_body(receive)
+    headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+    method, path = scope['method'], scope['path']
+
+    result = None
+    if method == 'GET' and path == '/api/health':
+        result = 200, _json_body(backend.health_status()), []
+    elif method == 'POST' and path in ('/api/predict', '/api/colleges') and _is_json(headers.get('content-type', '')):
+        try:
+            data = json.loads(body)
+        except ValueError:
+            pass  # Flask reports the malformed body
+        else:
+            if path == '/api/predict' and isinstance(data, dict) and data.get('intervals'):
+                result = await loop.run_in_executor(executor, _predict, data)
+            elif path == '/api/predict':
+                result = _predict(data)
+            elif not backend.wants_ndjson(headers.get('accept', ''), data):
+                result = await loop.run_in_executor(executor, _colleges, data, headers.get('accept-encoding', ''))
+
+    if result is None:
+        return await _send_flask_response(send, loop, scope, body)
+
+    # CORS headers as flask-cors adds them
+    status, content, extra_headers = result
+    response_headers = [('Content-Type', 'application/json'), ('Content-Length', str(len(content)))] + extra_headers
+    origin = headers.get('origin')
+    if origin:
+        response_headers += [('Access-Control-Allow-Origin', origin), ('Vary', 'Origin')]
+    else:
+        response_headers.append(('Access-Control-Allow-Origin', '*'))
+    await _send(send, status, response_headers, content)
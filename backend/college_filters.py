@@ -0,0 +1,180 @@
+"""
+Filters, sort orders and facet counts for /api/colleges.
+
+A FilterIndex is built once per cached college list: every filter column is
+factorized into int codes (in closing-rank order), so a request only indexes
+small lookup arrays by those codes instead of scanning the rows again.
+"""
+import numpy as np
+import pandas as pd
+
+# Request field -> column filtered on exact values and counted as a facet
+FACETS = {
+    'institute': 'College',
+    'collegeType': 'College Type',
+    'managementType': 'Management Type',
+    'salaryTier': 'Salary Tier',
+}
+SALARY_COLUMN = 'Expected Salary as per NIRF'
+COURSE_COLUMN = 'Course'
+
+SORT_FIELDS = ['closingRank', 'salary', 'relevance']
+SORT_ORDERS = ['asc', 'desc']
+# Highest salary and best search match first unless sortOrder says otherwise
+DEFAULT_DESCENDING = {'closingRank': False, 'salary': True, 'relevance': True}
+
+
+def _label(value) -> str:
+    # Salary tiers are stored as floats; 1.0 is tier "1"
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _as_list(value) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+class CollegeQuery:
+    """Filters, sort order and facet switch of one /api/colleges request."""
+
+    __slots__ = ('values', 'min_salary', 'branches', 'search_scores', 'sort_by', 'descending', 'facets')
+
+    def __init__(self, values: dict = None, min_salary: float = None, branches: list = None,
+                 search_scores: np.ndarray = None, sort_by: str = 'closingRank', descending: bool = None,
+                 facets: bool = False):
+        self.values = values or {}
+        self.min_salary = min_salary
+        self.branches = branches or []
+        self.search_scores = search_scores
+        self.sort_by = sort_by
+        self.descending = DEFAULT_DESCENDING[sort_by] if descending is None else descending
+        self.facets = facets
+
+    @classmethod
+    def from_request(cls, data: dict, search_index=None):
+        """
+        Query from the optional request fields (institute, collegeType,
+        managementType, salaryTier, minSalary, branch, search, sortBy,
+        sortOrder, facets), or None if the request has none of them. Filter
+        fields take one value or a list; an empty list does not filter.
+        `search` is scored with the dataset's SearchIndex.
+        """
+        fields = list(FACETS) + ['minSalary', 'branch', 'search', 'sortBy', 'sortOrder', 'facets']
+        if not any(data.get(field) is not None for field in fields):
+            return None
+
+        values = {}
+        for field in FACETS:
+            if data.get(field) is not None:
+                labels = {_label(value) for value in _as_list(data[field])}
+                if labels:
+                    values[field] = labels
+
+        min_salary = data.get('minSalary')
+        min_salary = None if min_salary is None else float(min_salary)
+
+        branch = data.get('branch')
+        branches = [] if branch is None else [str(keyword).strip().lower() for keyword in _as_list(branch)]
+
+        search = data.get('search')
+        search_scores = None if search is None else search_index.scores(str(search))
+
+        sort_by = data.get('sortBy') or 'closingRank'
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"sortBy must be one of {', '.join(SORT_FIELDS)}")
+        if sort_by == 'relevance' and search_scores is None:
+            raise ValueError("sortBy relevance needs a search")
+        sort_order = data.get('sortOrder')
+        if sort_order is not None and sort_order not in SORT_ORDERS:
+            raise ValueError(f"sortOrder must be one of {', '.join(SORT_ORDERS)}")
+        facets = data.get('facets')
+        if facets is not None and not isinstance(facets, bool):
+            raise ValueError("facets must be true or false")
+
+        return cls(values, min_salary, [keyword for keyword in branches if keyword], search_scores, sort_by,
+                   None if sort_order is None else sort_order == 'desc', bool(facets))
+
+
+class FilterIndex:
+    """
+    Filter codes and sort orders for the rows of one college list, in the
+    list's closing-rank order. Missing values get code -1.
+    """
+
+    __slots__ = ('codes', 'labels', 'positions', 'course_codes', 'courses', 'program_ids', 'salary',
+                 'salary_orders', 'nbytes')
+
+    def __init__(self, frame: pd.DataFrame):
+        self.codes, self.labels, self.positions = {}, {}, {}
+        for field, column in FACETS.items():
+            codes, uniques = pd.factorize(frame[column], sort=True)
+            self.codes[field] = codes.astype(np.int32)
+            self.labels[field] = [_label(value) for value in uniques]
+            self.positions[field] = {label: i for i, label in enumerate(self.labels[field])}
+
+        codes, uniques = pd.factorize(frame[COURSE_COLUMN], sort=True)
+        self.course_codes = codes.astype(np.int32)
+        self.courses = [str(course).lower() for course in uniques]
+        self.program_ids = frame['Program ID'].to_numpy(dtype=np.int32)
+
+        self.salary = frame[SALARY_COLUMN].to_numpy(dtype=np.float64)
+        # Stable sorts keep closing-rank order between equal salaries; NaN sorts last
+        self.salary_orders = {
+            False: np.argsort(self.salary, kind='stable').astype(np.int32),
+            True: np.argsort(-self.salary, kind='stable').astype(np.int32),
+        }
+        arrays = list(self.codes.values()) + [self.course_codes, self.program_ids, self.salary]
+        arrays += list(self.salary_orders.values())
+        self.nbytes = sum(array.nbytes for array in arrays)
+
+    def _wanted(self, field: str, labels: set) -> np.ndarray:
+        # One flag per code, plus a trailing False picked by code -1
+        wanted = np.zeros(len(self.labels[field]) + 1, dtype=bool)
+        for label in labels:
+            position = self.positions[field].get(label)
+            if position is not None:
+                wanted[position] = True
+        return wanted
+
+    def mask(self, start: int, query: CollegeQuery, skip: str = None) -> np.ndarray:
+        """Rows from `start` on that pass every filter of the query except `skip`."""
+        mask = np.zeros(len(self.salary), dtype=bool)
+        mask[start:] = True
+        for field, labels in query.values.items():
+            if field != skip:
+                mask &= self._wanted(field, labels)[self.codes[field]]
+        if query.min_salary is not None:
+            mask &= self.salary >= query.min_salary
+        if query.branches:
+            matches = [any(keyword in course for keyword in query.branches) for course in self.courses]
+            mask &= np.array(matches + [False])[self.course_codes]
+        if query.search_scores is not None:
+            mask &= query.search_scores[self.program_ids] > 0
+        return mask
+
+    def select(self, start: int, query: CollegeQuery) -> np.ndarray:
+        """Positions of the matching rows from `start` on, in the query's sort order."""
+        mask = self.mask(start, query)
+        if query.sort_by == 'salary':
+            order = self.salary_orders[query.descending]
+            return order[mask[order]]
+        if query.sort_by == 'relevance':
+            # Stable, so equal scores stay in closing-rank order
+            positions = np.flatnonzero(mask)
+            scores = query.search_scores[self.program_ids[positions]]
+            return positions[np.argsort(-scores if query.descending else scores, kind='stable')]
+        positions = np.flatnonzero(mask)
+        return positions[::-1] if query.descending else positions
+
+    def facet_counts(self, start: int, query: CollegeQuery) -> dict:
+        """
+        {field: {value: rows}} for every facet. Each facet is counted with all
+        other filters applied but not its own, so its other values stay visible.
+        """
+        facets = {}
+        for field, labels in self.labels.items():
+            codes = self.codes[field][self.mask(start, query, skip=field)]
+            counts = np.bincount(codes + 1, minlength=len(labels) + 1)[1:]
+            facets[field] = {label: int(count) for label, count in zip(labels, counts) if count}
+        return facets
@@ -0,0 +1,180 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from search_index import SearchIndex
+from snapshot import MISSING_RANK, coerce_numeric, load_snapshot
+
+# Default dataset - works for both local and Vercel
+CSV_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'College Databases - JoSAA 2024.csv'
+))
+
+# Quotas open to a candidate at colleges in their home state / any other state
+HOME_STATE_QUOTAS = ['HS', 'AI']
+OTHER_STATE_QUOTAS = ['OS', 'AI']
+
+# Special cases: states with their own quota codes
+SPECIAL_HOME_STATE_QUOTAS = {
+    'Goa': ['HS', 'AI', 'GO'],
+    'Jammu and Kashmir': ['HS', 'AI', 'JK', 'LA'],
+}
+
+GENDER_POOLS = ['Male', 'Female']
+
+# Eligible if Closing Rank >= DEFAULT_RANK_MARGIN * category rank (10% error margin)
+DEFAULT_RANK_MARGIN = 0.9
+
+# Columns returned by /api/colleges, renamed for the frontend
+RESULT_COLUMNS = {
+    'Institute': 'College',
+    'Academic Program Name': 'Course',
+    'State': 'State',
+    'Closing Rank': 'Closing Rank',
+    'Expected Salary': 'Expected Salary as per NIRF',
+}
+RESULT_NAMES = list(RESULT_COLUMNS.values())
+
+# Extra columns kept next to the result rows for /api/colleges filters, facets
+# and admission chances (Program ID: the row's document in the dataset's SearchIndex)
+EXTRA_COLUMNS = ['College Type', 'Management Type', 'Salary Tier', 'Program ID', 'Opening Rank']
+
+
+class RankBucket:
+    """
+    Result rows for one (seat type, gender pool, home state), presorted by
+    closing rank so an eligibility query is a binary search plus a slice.
+
+    `rows` is shared by every bucket of a gender pool; a bucket only owns the
+    int32 positions of its rows and their closing ranks. Besides the result
+    columns, `rows` holds the EXTRA_COLUMNS.
+    """
+
+    __slots__ = ('rows', 'positions', 'closing_ranks')
+
+    def __init__(self, rows: pd.DataFrame, positions: np.ndarray):
+        self.rows = rows
+        self.positions = positions.astype(np.int32)
+        self.closing_ranks = rows['Closing Rank'].to_numpy()[positions]
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def start(self, category_rank: int, margin: float = DEFAULT_RANK_MARGIN) -> int:
+        """Position of the first row with Closing Rank >= margin * category_rank."""
+        return int(np.searchsorted(self.closing_ranks, margin * category_rank, side='left'))
+
+    def all_rows(self, columns: list = RESULT_NAMES) -> pd.DataFrame:
+        return self.rows.iloc[self.positions][columns]
+
+
+class CollegeIndex:
+    """
+    In-memory JoSAA table, indexed for /api/colleges and /api/cutoff.
+    The table must have the column types of a snapshot (snapshot.coerce_numeric:
+    ranks int32 with MISSING_RANK); it is used as is, not copied, so a table
+    loaded from a snapshot stays memory-mapped.
+
+    JEE Main rows are kept as RankBucket objects per (seat type, gender
+    pool, home state); states without any college share the None bucket.
+    `search` indexes the distinct (Institute, Academic Program Name) pairs and
+    `cutoffs` holds the closing rank of every seat for /api/cutoff.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        # cutoff_index uses this module's quota rules, so it is imported here
+        from cutoff_index import CutoffIndex
+
+        program_ids, programs = pd.MultiIndex.from_frame(df[['Institute', 'Academic Program Name']]).factorize()
+        df['Program ID'] = program_ids.astype(np.int32)
+        self.search = SearchIndex(*zip(*programs)) if len(programs) else SearchIndex([], [])
+        self.df = df
+        self.home_states = sorted(df['State'].dropna().unique())
+        self.buckets = self._build_rank_buckets('JEE Main')
+        self.cutoffs = CutoffIndex(df)
+
+    @classmethod
+    def from_csv(cls, path: str = CSV_PATH) -> 'CollegeIndex':
+        return cls(coerce_numeric(pd.read_csv(path)))
+
+    @classmethod
+    def load(cls, path: str = CSV_PATH) -> 'CollegeIndex':
+        """Load from the columnar snapshot of the CSV if one is up to date, else parse the CSV."""
+        df = load_snapshot(path)
+        if df is None:
+            print(f"No up-to-date snapshot for {os.path.basename(path)}, parsing CSV")
+            return cls.from_csv(path)
+        return cls(df)
+
+    def _build_rank_buckets(self, entrance_test: str) -> dict:
+        buckets = {}
+        test_rows = self.df[self.df['Entrance Test'] == entrance_test]
+        for seat_type, partition in test_rows.groupby('Seat Type', sort=False, observed=True):
+            for gender in GENDER_POOLS:
+                pool = filter_gender_pool(partition, gender)
+                pool = pool[pool['Closing Rank'] != MISSING_RANK]
+                college_state = pool.groupby('College ID')['State'].transform('first').to_numpy()
+                quota = pool['Quota'].to_numpy()
+
+                # Sort once per pool; every state bucket is a subsequence of it
+                order = np.argsort(pool['Closing Rank'].to_numpy(), kind='stable')
+                rows = pool[list(RESULT_COLUMNS) + EXTRA_COLUMNS].rename(columns=RESULT_COLUMNS)
+                rows = rows.iloc[order].reset_index(drop=True)
+                college_state, quota = college_state[order], quota[order]
+
+                for state in [None] + self.home_states:
+                    mask = state_quota_mask(quota, college_state, state)
+                    buckets[(seat_type, gender, state)] = RankBucket(rows, np.flatnonzero(mask))
+        return buckets
+
+    def bucket_key(self, seat_type: str, gender: str, state: str) -> tuple:
+        """(seat type, gender pool, home state) key; any gender other than Male uses the Female pool."""
+        gender = 'Male' if gender == 'Male' else 'Female'
+        if state not in self.home_states:
+            state = None
+        return seat_type, gender, state
+
+    def bucket(self, seat_type: str, gender: str, state: str) -> RankBucket:
+        """JEE Main bucket for a candidate."""
+        bucket = self.buckets.get(self.bucket_key(seat_type, gender, state))
+        if bucket is None:
+            rows = self.df.iloc[0:0][list(RESULT_COLUMNS) + EXTRA_COLUMNS].rename(columns=RESULT_COLUMNS)
+            bucket = RankBucket(rows, np.arange(0))
+        return bucket
+
+
+def filter_gender_pool(df: pd.DataFrame, gender: str) -> pd.DataFrame:
+    """
+    Male candidates only see Gender-Neutral seats. Female candidates see only
+    the Female-only rows of colleges that have any, and every row otherwise.
+    Rows without a College ID are dropped.
+    """
+    if gender == 'Male':
+        return df[(df['Gender'] == 'Gender-Neutral') & df['College ID'].notna()]
+
+    df = df[df['College ID'].notna()]
+    female_only = df['Gender'].str.contains('Female-only', na=False)
+    college_has_female_only = female_only.groupby(df['College ID']).transform('any')
+    return df[female_only | ~college_has_female_only]
+
+
+def filter_state_quota(df: pd.DataFrame, state: str) -> pd.DataFrame:
+    """
+    Home-state colleges (by the State of the college's first row) allow HS/AI
+    quotas, plus GO or JK/LA for Goa and Jammu and Kashmir; every other
+    college allows OS/AI.
+    """
+    df = df[df['College ID'].notna()]
+    college_state = df.groupby('College ID')['State'].transform('first').to_numpy()
+    return df[state_quota_mask(df['Quota'].to_numpy(), college_state, state)]
+
+
+def state_quota_mask(quota: np.ndarray, college_state: np.ndarray, state: str) -> np.ndarray:
+    """Boolean mask of rows whose quota is open to a candidate from `state`."""
+    home_quotas = SPECIAL_HOME_STATE_QUOTAS.get(state, HOME_STATE_QUOTAS)
+    return np.where(
+        college_state == state,
+        np.isin(quota, home_quotas),
+        np.isin(quota, OTHER_STATE_QUOTAS),
+    )
@@ -0,0 +1,123 @@
+"""
+Closing ranks by seat for /api/cutoff, the reverse of /api/colleges: the
+category rank a candidate needs for one program.
+
+Every JoSAA row with a College ID and a numeric closing rank is one seat,
+keyed by (College ID, Academic Program Name, Seat Type, Gender, Quota). A
+candidate's seats in a program are the few keys their gender pool and home
+state allow, chosen by the same rules as the /api/colleges buckets
+(college_index.filter_gender_pool and state_quota_mask), so a lookup is a
+handful of dict probes and the cutoff is the largest closing rank among them.
+"""
+import pandas as pd
+
+from college_index import HOME_STATE_QUOTAS, OTHER_STATE_QUOTAS, SPECIAL_HOME_STATE_QUOTAS
+from snapshot import MISSING_RANK
+
+GENDER_NEUTRAL = 'Gender-Neutral'
+
+
+class CutoffIndex:
+    """
+    seats: (College ID, program, seat type, gender, quota) -> (opening rank, closing rank)
+    programs: (College ID, program) -> (institute, college state, entrance test)
+    institute_ids: institute -> its College IDs (a few institutes have two)
+    """
+
+    __slots__ = ('seats', 'programs', 'institute_ids', 'female_only', 'female_genders')
+
+    def __init__(self, df: pd.DataFrame):
+        df = df[df['College ID'].notna()]
+        seats = df[df['Closing Rank'] != MISSING_RANK]
+        keys = zip(seats['College ID'], seats['Academic Program Name'], seats['Seat Type'], seats['Gender'],
+                   seats['Quota'])
+        self.seats = {
+            key: (None if opening_rank == MISSING_RANK else opening_rank, closing_rank)
+            for key, opening_rank, closing_rank in zip(keys, seats['Opening Rank'].tolist(),
+                                                       seats['Closing Rank'].tolist())
+        }
+
+        # A college's state is the State of its first row, as in /api/colleges
+        college_state = df.groupby('College ID')['State'].transform('first')
+        self.programs = {}
+        for key, institute, state, test in zip(zip(df['College ID'], df['Academic Program Name']),
+                                               df['Institute'], college_state, df['Entrance Test']):
+            self.programs.setdefault(key, (institute, state, test))
+        self.institute_ids = {}
+        for institute, college_id in zip(df['Institute'], df['College ID']):
+            ids = self.institute_ids.setdefault(institute, [])
+            if college_id not in ids:
+                ids.append(college_id)
+
+        # Female candidates only get the Female-only seats of colleges that have
+        # any for their seat type, and every seat elsewhere
+        female = df['Gender'].str.contains('Female-only', na=False)
+        self.female_only = set(zip(df.loc[female, 'College ID'], df.loc[female, 'Seat Type']))
+        self.female_genders = sorted(df.loc[female, 'Gender'].unique())
+
+    def __len__(self) -> int:
+        return len(self.seats)
+
+    def college_ids(self, target: dict) -> list:
+        """College IDs of a target given as collegeId or institute (exact name)."""
+        college_id = target.get('collegeId')
+        if college_id is not None:
+            return [college_id]
+        institute = target.get('institute')
+        if institute is None:
+            raise ValueError("collegeId or institute is required")
+        college_ids = self.institute_ids.get(institute)
+        if college_ids is None:
+            raise ValueError(f"Unknown institute: {institute}")
+        return college_ids
+
+    def genders(self, college_id: str, seat_type: str, gender: str) -> list:
+        """Seat genders open to a candidate; any gender other than Male uses the Female pool."""
+        if gender == 'Male':
+            return [GENDER_NEUTRAL]
+        if (college_id, seat_type) in self.female_only:
+            return self.female_genders
+        return [GENDER_NEUTRAL, *self.female_genders]
+
+    def cutoff(self, target: dict, seat_type: str, gender: str, state: str) -> dict:
+        """
+        The seats of one program (target: collegeId or institute, and program)
+        open to a candidate, and the most lenient of them. Raises ValueError if
+        the program is unknown or has no such seat.
+        """
+        program = target.get('program')
+        seats = []
+        institute = None
+        for college_id in self.college_ids(target):
+            if (college_id, program) not in self.programs:
+                continue
+            institute, college_state, _ = self.programs[(college_id, program)]
+            if college_state == state:
+                quotas = SPECIAL_HOME_STATE_QUOTAS.get(state, HOME_STATE_QUOTAS)
+            else:
+                quotas = OTHER_STATE_QUOTAS
+            for seat_gender in self.genders(college_id, seat_type, gender):
+                for quota in quotas:
+                    ranks = self.seats.get((college_id, program, seat_type, seat_gender, quota))
+                    if ranks is not None:
+                        seats.append({'collegeId': college_id, 'gender': seat_gender, 'quota': quota,
+                                      'openingRank': ranks[0], 'closingRank': ranks[1]})
+        if institute is None:
+            raise ValueError(f"Unknown program: {program}")
+        if not seats:
+            raise ValueError(f"No {seat_type} seats for this candidate in {program} at {institute}")
+
+        best = max(seats, key=lambda seat: seat['closingRank'])
+        institute, _, entrance_test = self.programs[(best['collegeId'], program)]
+        return {
+            'collegeId': best['collegeId'],
+            'institute': institute,
+            'program': program,
+            'entranceTest': entrance_test,
+            'seatType': seat_type,
+            'gender': best['gender'],
+            'quota': best['quota'],
+            'openingRank': best['openingRank'],
+            'closingRank': best['closingRank'],
+            'seats': seats,
+        }
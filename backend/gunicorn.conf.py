@@ -0,0 +1,32 @@
+"""
+Gunicorn settings for the backend (render.yaml passes --config backend/gunicorn.conf.py).
+
+The app, the conversion models and every JoSAA dataset in registry.json are
+loaded once in the master before it forks, so the workers share one read-only
+copy of the data instead of each loading their own (app.py itself imports
+neither pandas nor NumPy; load_colleges does, here, before the fork). Garbage
+collection is off while loading and the loaded objects are frozen before the
+fork, so collections in the workers do not write to (and un-share) the pages
+holding them.
+
+A dataset that is hot-reloaded later is loaded again in each worker; restart
+gunicorn to share the new data.
+"""
+import gc
+
+preload_app = True
+
+# Avoid freed holes in the pages shared with the workers
+gc.disable()
+
+
+def when_ready(server):
+    # Runs in the master after preload_app imported app.py, before any fork
+    from app import load_colleges
+
+    load_colleges()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    gc.enable()
@@ -0,0 +1,76 @@
+"""
+Size-bounded LRU cache for built responses. Kept apart from response_cache.py
+(which needs NumPy and pandas) so the app can create and report on its cache
+without importing them.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+# Bounds for the /api/colleges response cache (override with environment variables)
+MAX_ENTRIES = int(os.environ.get('COLLEGE_CACHE_MAX_ENTRIES', 512))
+MAX_BYTES = int(os.environ.get('COLLEGE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by entry count and by total size in bytes.
+    Values must expose an `nbytes` attribute used for the memory cap.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        # Build outside the lock; concurrent misses on one key just build twice
+        value = build()
+        if value.nbytes > self.max_bytes:
+            return value
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous.nbytes
+            self._entries[key] = value
+            self.bytes += value.nbytes
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.nbytes
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'maxEntries': self.max_entries,
+                'maxBytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+# /api/colleges result lists (response_cache.CollegeList)
+college_cache = LRUCache()
@@ -0,0 +1,106 @@
+"""
+Piecewise polynomial models (AIR -> category rank) defined as data.
+
+Each model is a list of segments sorted by upper breakpoint. A segment is
+    {"upper": 10000, "inclusive": false, "slope": 0.0251, "intercept": -19.5}
+and evaluates quadratic * x**2 + slope * x + intercept ("quadratic" is optional)
+for x below its breakpoint (x <= upper when inclusive, x < upper otherwise).
+The last segment has no "upper" and covers everything above.
+
+Inverse breakpoints are derived from the forward table once, when the model
+is built: segment i covers y up to its own value at its breakpoint.
+"""
+import math
+import os
+from bisect import bisect_left
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+
+# Digits kept on derived inverse breakpoints (drops float noise like 2189.0000000000005)
+BOUNDARY_DIGITS = 6
+
+
+class PiecewiseModel:
+    """One category's AIR -> category rank model and its inverse."""
+
+    __slots__ = ('name', 'uppers', 'inclusive', 'quadratics', 'slopes', 'intercepts',
+                 'domain_min', 'y_min', 'y_uppers', '_coefficients', '_exclusive')
+
+    def __init__(self, name: str, segments: list, domain_min: float = None):
+        if not segments or 'upper' in segments[-1]:
+            raise ValueError(f"{name}: the last segment must have no upper breakpoint")
+        self.name = name
+        self.uppers = [float(segment['upper']) for segment in segments[:-1]]
+        self.inclusive = [bool(segment.get('inclusive', True)) for segment in segments[:-1]]
+        self.quadratics = [float(segment.get('quadratic', 0.0)) for segment in segments]
+        self.slopes = [float(segment['slope']) for segment in segments]
+        self.intercepts = [float(segment['intercept']) for segment in segments]
+        if any(low >= high for low, high in zip(self.uppers, self.uppers[1:])):
+            raise ValueError(f"{name}: breakpoints must be strictly increasing")
+        self._coefficients = list(zip(self.quadratics, self.slopes, self.intercepts))
+        # Exclusive breakpoints, where a value equal to the bound belongs to the next segment
+        self._exclusive = [not inclusive for inclusive in self.inclusive] + [False]
+
+        # Inverse breakpoints: each segment's value at its own breakpoint
+        self.domain_min = domain_min
+        self.y_min = None if domain_min is None else self.segment_value(0, domain_min)
+        self.y_uppers = [round(self.segment_value(i, upper), BOUNDARY_DIGITS) for i, upper in enumerate(self.uppers)]
+        if any(low >= high for low, high in zip(self.y_uppers, self.y_uppers[1:])):
+            raise ValueError(f"{name}: model is not increasing, cannot derive its inverse")
+
+    def __len__(self) -> int:
+        return len(self.slopes)
+
+    def _find(self, bounds: list, value: float) -> int:
+        """Index of the segment holding value (bisect over the sorted breakpoints)."""
+        i = bisect_left(bounds, value)
+        if self._exclusive[i] and value == bounds[i]:
+            i += 1
+        return i
+
+    def segment_value(self, i: int, x: float) -> float:
+        quadratic, slope, intercept = self._coefficients[i]
+        if quadratic:
+            return quadratic * (x ** 2) + slope * x + intercept
+        return slope * x + intercept
+
+    def evaluate(self, x: float) -> float:
+        quadratic, slope, intercept = self._coefficients[self._find(self.uppers, x)]
+        if quadratic:
+            return quadratic * (x ** 2) + slope * x + intercept
+        return slope * x + intercept
+
+    def inverse(self, y: float) -> float:
+        """x with evaluate(x) == y. Raises ValueError where the model has no inverse."""
+        if self.y_min is not None and y < self.y_min:
+            raise ValueError(f"Input y is outside the range of the {self.name} model")
+        i = self._find(self.y_uppers, y)
+        quadratic, slope, intercept = self._coefficients[i]
+        if not quadratic:
+            return (y - intercept) / slope
+
+        # Quadratic segment: take the root that lies inside the segment
+        a, b, c = quadratic, slope, intercept - y
+        disc = b * b - 4.0 * a * c
+        if disc < 0:
+            raise ValueError(f"No real solution for quadratic inverse in segment {i + 1}")
+        sqrt_disc = math.sqrt(disc)
+        for x in ((-b + sqrt_disc) / (2.0 * a), (-b - sqrt_disc) / (2.0 * a)):
+            if self.in_segment(i, x):
+                return x
+        raise ValueError(f"No valid root in the domain of segment {i + 1}")
+
+    def in_segment(self, i: int, x: float) -> bool:
+        if i > 0 and (x <= self.uppers[i - 1] if self.inclusive[i - 1] else x < self.uppers[i - 1]):
+            return False
+        if i < len(self.uppers) and (x > self.uppers[i] if self.inclusive[i] else x >= self.uppers[i]):
+            return False
+        return True
+
+
+def build_models(table: dict) -> dict:
+    """{category: PiecewiseModel} from a model file's "air_to_category_rank" table."""
+    return {
+        category: PiecewiseModel(category, model['segments'], model.get('domain_min'))
+        for category, model in table.items()
+    }
@@ -0,0 +1,294 @@
+import json
+import math
+import os
+
+from piecewise import MODELS_DIR, build_models
+
+# Constants
+TOTAL_MARKS = 300  # JEE Mains total marks
+a = -0.1035 #exponential coefficient
+
+# ============================
+# Basic Conversion Functions
+# ============================
+
+def marks_to_percentage(score: int, total: int = TOTAL_MARKS) -> float:
+    return score * 100 / total
+
+def percentage_to_marks(percentage: float, total: int = TOTAL_MARKS) -> int:
+    return math.floor(percentage * total / 100)
+
+class PercentileCurve:
+    """
+    An exam's percentage -> percentile model, loaded from the
+    "percentage_to_percentile" entry of its model file:
+        {"logistic": {"upper": 25, "lower_asymptote": ..., "upper_asymptote": ..., "rate": ..., "midpoint": ...},
+         "logarithmic": {"upper": 40, "intercept": ..., "slope": ...},
+         "exponential": {"rate": ...}}
+    Each segment covers percentages up to its "upper" (inclusive); the
+    exponential one covers everything above.
+    """
+
+    __slots__ = ('logistic_upper', 'logistic_l', 'logistic_u', 'logistic_k', 'logistic_x0',
+                 'log_upper', 'log_intercept', 'log_slope', 'exp_rate', 'logistic_top', 'log_top')
+
+    def __init__(self, logistic: dict, logarithmic: dict, exponential: dict):
+        self.logistic_upper = float(logistic['upper'])
+        self.logistic_l = float(logistic['lower_asymptote'])
+        self.logistic_u = float(logistic['upper_asymptote'])
+        self.logistic_k = float(logistic['rate'])
+        self.logistic_x0 = float(logistic['midpoint'])
+        self.log_upper = float(logarithmic['upper'])
+        self.log_intercept = float(logarithmic['intercept'])
+        self.log_slope = float(logarithmic['slope'])
+        self.exp_rate = float(exponential['rate'])
+        if not 0 < self.logistic_upper < self.log_upper:
+            raise ValueError("percentage_to_percentile: breakpoints must be positive and increasing")
+
+        # Exact segment boundaries for the inverse: the percentile at each breakpoint
+        self.logistic_top = self.logistic_l + (self.logistic_u - self.logistic_l) / (
+            1 + math.exp(-self.logistic_k * (self.logistic_upper - self.logistic_x0)))  # ~94.417
+        self.log_top = self.log_intercept + self.log_slope * math.log(self.log_upper)  # ~97.796
+
+def percentage_to_percentile(percentage: float, model: 'ExamModel' = None) -> float:
+    """
+    Piecewise logistic model for percentage to percentile conversion.
+    - 0 to 25: Logistic function
+    - 25 to 40: Logarithmic function
+    - 40 and above: Exponential function
+    (the breakpoints and coefficients are the model's PercentileCurve)
+    """
+    curve = (model or DEFAULT_MODEL).percentile_curve
+    if percentage <= curve.logistic_upper:
+        # Logistic model
+        percentile = curve.logistic_l + (curve.logistic_u - curve.logistic_l) / (
+            1 + math.exp(-curve.logistic_k * (percentage - curve.logistic_x0)))
+    elif percentage <= curve.log_upper:
+        # Logarithmic model
+        percentile = curve.log_intercept + curve.log_slope * math.log(percentage)
+    else:  # percentage > log_upper
+        # Exponential model
+        percentile = 100 * (1 - math.exp(-curve.exp_rate * percentage))
+    return percentile
+
+def percentile_to_percentage(percentile: float, model: 'ExamModel' = None) -> float:
+    """
+    Inverse of percentage_to_percentile using piecewise model.
+    Uses precise segment boundaries.
+    """
+    curve = (model or DEFAULT_MODEL).percentile_curve
+    if percentile <= curve.logistic_top:
+        # Invert logistic model (segment 1: 0-25%) analytically
+        # percentile = L + (U - L) / (1 + exp(-k * (percentage - x0)))
+        # percentage = x0 - ln((U - L) / (percentile - L) - 1) / k
+        # Clamped to the segment's 0-25% domain
+        if percentile <= curve.logistic_l:
+            return 0.0
+        percentage = curve.logistic_x0 - math.log(
+            (curve.logistic_u - curve.logistic_l) / (percentile - curve.logistic_l) - 1) / curve.logistic_k
+        return min(max(percentage, 0.0), curve.logistic_upper)
+
+    elif percentile <= curve.log_top:
+        # Invert logarithmic model (segment 2: 25-40%)
+        # percentile = 65.1 + 8.95 * ln(percentage)
+        # ln(percentage) = (percentile - 65.1) / 8.95
+        # percentage = exp((percentile - 65.1) / 8.95)
+        percentage = math.exp((percentile - curve.log_intercept) / curve.log_slope)
+        return percentage
+
+    else:  # percentile > log_top
+        # Invert exponential model (segment 3: 40+%)
+        # percentile = 100 * (1 - exp(-0.095 * percentage))
+        # 1 - percentile/100 = exp(-0.095 * percentage)
+        # ln(1 - percentile/100) = -0.095 * percentage
+        # percentage = -ln(1 - percentile/100) / 0.095
+        if percentile >= 100:
+            return 100.0
+        percentage = -math.log(1 - percentile / 100) / curve.exp_rate
+        return percentage
+
+def percentile_to_air(percentile: float, model: 'ExamModel' = None) -> int:
+    return int((model or DEFAULT_MODEL).test_takers * (1 - percentile / 100))
+
+def air_to_percentile(air: int, model: 'ExamModel' = None) -> float:
+    return 100 * (1 - air / (model or DEFAULT_MODEL).test_takers)
+
+# ============================
+# AIR <-> Category Rank
+# ============================
+
+def air_to_cat(category: str, rank: float, model: 'ExamModel' = None) -> int:
+    """Convert All India Rank to Category Rank"""
+    category_models = (model or DEFAULT_MODEL).category_models
+    if category == "OPEN":
+        raw = rank
+    elif category in category_models:
+        raw = category_models[category].evaluate(rank)
+    else:
+        raise ValueError("Invalid category")
+
+    rounded = int(round(raw))
+    if rounded <= 0:
+        return 1
+    return rounded
+
+def cat_to_air(category: str, rank: float, model: 'ExamModel' = None) -> int:
+    """Convert Category Rank to All India Rank"""
+    category_models = (model or DEFAULT_MODEL).category_models
+    if category == "OPEN":
+        raw = rank
+    elif category in category_models:
+        raw = category_models[category].inverse(rank)
+    else:
+        raise ValueError("Invalid category")
+
+    rounded = int(round(raw))
+    if rounded < 0:
+        return 1
+    return rounded
+
+# ============================
+# Prediction
+# ============================
+
+MODEL_PATH = os.path.join(MODELS_DIR, 'jee_main_2024.json')
+
+# Spread of each model stage, used for confidence intervals (see uncertainty.py):
+# log-scale sd of 100 - percentile from the percentage model, relative sd of
+# the number of test takers, log-scale sd of category ranks from the category models
+DEFAULT_UNCERTAINTY = {'percentile_tail': 0.1, 'test_takers': 0.02, 'category_rank': 0.05}
+
+class ExamModel:
+    """
+    One exam year's conversion model, loaded from a file in backend/models:
+    the number of test takers, the percentage -> percentile curve, the
+    AIR <-> category rank model of every reserved category and the spread
+    of each stage. Built once and never
+    modified, so it can be shared between threads and swapped out whole.
+    """
+
+    __slots__ = ('name', 'test_takers', 'percentile_curve', 'category_models', 'uncertainty', 'marks_table')
+
+    def __init__(self, name: str, test_takers: int, percentile_curve: PercentileCurve, category_models: dict,
+                 uncertainty: dict = None):
+        self.name = name
+        self.test_takers = int(test_takers)
+        self.percentile_curve = percentile_curve
+        self.category_models = category_models
+        self.uncertainty = {**DEFAULT_UNCERTAINTY, **(uncertainty or {})}
+
+        # Every marks-based prediction: marks_table[category][marks] for marks 0..300
+        self.marks_table = {
+            category: [compute_results(category, 'marks', float(marks), self) for marks in range(TOTAL_MARKS + 1)]
+            for category in ['OPEN', *category_models]
+        }
+
+    @classmethod
+    def load(cls, path: str = MODEL_PATH) -> 'ExamModel':
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data['name'], data['test_takers'], PercentileCurve(**data['percentage_to_percentile']),
+                   build_models(data['air_to_category_rank']), data.get('uncertainty'))
+
+    def has_category(self, category: str) -> bool:
+        return category == 'OPEN' or category in self.category_models
+
+def predict_results(category: str, input_type: str, input_value, model: ExamModel = None) -> dict:
+    """
+    Derive marks, percentage, percentile, AIR and category rank from any one of them.
+    Raises ValueError/TypeError for invalid input.
+    """
+    model = model or DEFAULT_MODEL
+    input_value = float(input_value)
+
+    # Whole marks (negative clamped to 0, 300 and above capped) come from the precomputed table
+    if input_type == 'marks' and input_value.is_integer() and category in model.marks_table:
+        return dict(model.marks_table[category][min(max(int(input_value), 0), TOTAL_MARKS)])
+    return compute_results(category, input_type, input_value, model)
+
+def request_results(data: dict, model: ExamModel = None) -> dict:
+    """
+    Results for one /api/predict request body, with confidence intervals when
+    it sets "intervals". Used by both the Flask backend and the Vercel function.
+    Raises for invalid input.
+    """
+    model = model or DEFAULT_MODEL
+    results = predict_results(data.get('category'), data.get('inputType'), data.get('inputValue'), model)
+    if data.get('intervals'):
+        # Only interval requests import NumPy
+        from uncertainty import DEFAULT_CONFIDENCE, prediction_intervals
+        confidence = float(data.get('confidence', DEFAULT_CONFIDENCE))
+        results['intervals'] = prediction_intervals(data.get('category'), data.get('inputType'), results, model,
+                                                    confidence)
+    return results
+
+def compute_results(category: str, input_type: str, input_value: float, model: ExamModel = None) -> dict:
+    """Run the conversion chain for predict_results (no table lookup)."""
+    # Initialize results
+    results = {
+        'marks': None,
+        'percentage': None,
+        'percentile': None,
+        'allIndiaRank': None,
+        'categoryRank': None
+    }
+
+    # Based on input type, calculate all other values
+    if input_type == 'marks':
+        # Handle negative marks - treat as 0
+        input_value = max(0, input_value)
+        results['marks'] = int(input_value)
+
+        # Edge case: 300 marks = 100 percentile, AIR = 1
+        if input_value >= 300:
+            results['marks'] = 300
+            results['percentage'] = 100.0
+            results['percentile'] = 100.0
+            results['allIndiaRank'] = 1
+            results['categoryRank'] = 1
+        else:
+            results['percentage'] = round(marks_to_percentage(input_value), 2)
+            results['percentile'] = round(percentage_to_percentile(results['percentage'], model), 5)
+            results['allIndiaRank'] = percentile_to_air(results['percentile'], model)
+            results['categoryRank'] = air_to_cat(category, results['allIndiaRank'], model)
+
+    elif input_type == 'percentage':
+        # Edge case: 100 percentage = 100 percentile, AIR = 1
+        if input_value >= 100:
+            results['percentage'] = 100.0
+            results['marks'] = 300
+            results['percentile'] = 100.0
+            results['allIndiaRank'] = 1
+            results['categoryRank'] = 1
+        else:
+            results['percentage'] = round(input_value, 2)
+            results['marks'] = percentage_to_marks(input_value)
+            results['percentile'] = round(percentage_to_percentile(input_value, model), 5)
+            results['allIndiaRank'] = percentile_to_air(results['percentile'], model)
+            results['categoryRank'] = air_to_cat(category, results['allIndiaRank'], model)
+
+    elif input_type == 'percentile':
+        results['percentile'] = round(input_value, 5)
+        results['percentage'] = round(percentile_to_percentage(input_value, model), 2)
+        results['marks'] = percentage_to_marks(results['percentage'])
+        results['allIndiaRank'] = percentile_to_air(input_value, model)
+        results['categoryRank'] = air_to_cat(category, results['allIndiaRank'], model)
+
+    elif input_type == 'allIndiaRank':
+        results['allIndiaRank'] = int(input_value)
+        results['percentile'] = round(air_to_percentile(int(input_value), model), 5)
+        results['percentage'] = round(percentile_to_percentage(results['percentile'], model), 2)
+        results['marks'] = percentage_to_marks(results['percentage'])
+        results['categoryRank'] = air_to_cat(category, int(input_value), model)
+
+    elif input_type == 'categoryRank':
+        results['categoryRank'] = int(input_value)
+        results['allIndiaRank'] = cat_to_air(category, int(input_value), model)
+        results['percentile'] = round(air_to_percentile(results['allIndiaRank'], model), 5)
+        results['percentage'] = round(percentile_to_percentage(results['percentile'], model), 2)
+        results['marks'] = percentage_to_marks(results['percentage'])
+
+    return results
+
+# Built-in model, used when no model is given
+DEFAULT_MODEL = ExamModel.load()
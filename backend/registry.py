@@ -0,0 +1,278 @@
+"""
+Versioned conversion models and JoSAA datasets, selected per request by year/round.
+
+backend/registry.json lists what is served:
+
+    {
+      "default_year": "2024",
+      "years": {
+        "2024": {
+          "model": "models/jee_main_2024.json",
+          "default_round": "final",
+          "rounds": {"final": "../College Databases - JoSAA 2024.csv"}
+        }
+      }
+    }
+
+Paths are relative to the manifest. Every listed model and dataset is loaded
+into one immutable RegistrySnapshot. The manifest and the files it lists are
+polled for changes; a changed set is loaded in a background thread and swapped
+in with a single assignment, so a request that took the previous snapshot
+keeps using it. Replace files with a rename (not an in-place write) so a poll
+never sees half a file.
+"""
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+
+from prediction import DEFAULT_MODEL, MODEL_PATH, ExamModel
+
+MANIFEST_PATH = os.environ.get(
+    'REGISTRY_MANIFEST', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'registry.json')
+)
+
+# Seconds between checks of the manifest and its files for changes
+POLL_SECONDS = float(os.environ.get('REGISTRY_POLL_SECONDS', 5))
+
+_generations = itertools.count(1)
+
+
+def _file_stamp(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class RegistrySnapshot:
+    """
+    Everything listed in one version of the manifest, fully loaded; or only its
+    models (datasets is None) until a request needs the JoSAA data.
+    """
+
+    __slots__ = ('default_year', 'years', 'models', 'datasets', 'stamps', 'generation', 'loaded_at')
+
+    def __init__(self, default_year: str, years: dict, models: dict, datasets: dict, stamps: dict):
+        self.default_year = default_year
+        self.years = years
+        self.models = models
+        self.datasets = datasets
+        self.stamps = stamps
+        self.generation = next(_generations)
+        self.loaded_at = time.time()
+
+    def _year(self, year) -> str:
+        year = self.default_year if year is None else str(year)
+        if year not in self.years:
+            raise ValueError(f"Unknown year: {year}")
+        return year
+
+    def model(self, year=None) -> ExamModel:
+        """Conversion model for a year (default year if None)."""
+        return self.models[self._year(year)]
+
+    def dataset(self, year=None, round=None) -> tuple:
+        """
+        (cache key, CollegeIndex) for a JoSAA year and round (defaults if None).
+        The key changes whenever the dataset file does.
+        """
+        if self.datasets is None:
+            raise RuntimeError("Datasets are not loaded: use Registry.current(datasets=True)")
+        year = self._year(year)
+        round = self.years[year]['default_round'] if round is None else str(round)
+        dataset = self.datasets.get((year, round))
+        if dataset is None:
+            raise ValueError(f"Unknown round for {year}: {round}")
+        return dataset
+
+    def stats(self) -> dict:
+        return {
+            'generation': self.generation,
+            'loadedAt': self.loaded_at,
+            'defaultYear': self.default_year,
+            'datasetsLoaded': self.datasets is not None,
+            'years': {year: sorted(entry['rounds']) for year, entry in self.years.items()},
+        }
+
+
+def load_registry(manifest_path: str = MANIFEST_PATH, previous: RegistrySnapshot = None,
+                  datasets: bool = True) -> RegistrySnapshot:
+    """
+    Load every model and (unless datasets is False) every dataset listed in the
+    manifest. Files whose stamp has not changed since `previous` are reused
+    instead of loaded again.
+    """
+    stamps = {manifest_path: _file_stamp(manifest_path)}
+    default_year, years = read_manifest(manifest_path)
+
+    reusable = {}
+    if previous is not None:
+        for year, model in previous.models.items():
+            reusable[previous.years[year]['model']] = model
+        for (year, round), dataset in (previous.datasets or {}).items():
+            reusable[previous.years[year]['rounds'][round]] = dataset
+
+    def load(path: str, loader):
+        stamp = _file_stamp(path)
+        if stamp is None:
+            raise FileNotFoundError(path)
+        if path in reusable and previous.stamps.get(path) == stamp:
+            value = reusable[path]
+        else:
+            value = loader(path, stamp)
+        stamps[path] = stamp
+        return value
+
+    models = {year: load(entry['model'], lambda path, stamp: ExamModel.load(path)) for year, entry in years.items()}
+    if not datasets:
+        return RegistrySnapshot(default_year, years, models, None, stamps)
+
+    # pandas is only imported once datasets are loaded
+    from college_index import CollegeIndex
+
+    datasets = {}
+    for year, entry in years.items():
+        for round, path in entry['rounds'].items():
+            datasets[(year, round)] = load(
+                path, lambda path, stamp: ((year, round) + stamp, CollegeIndex.load(path))
+            )
+    return RegistrySnapshot(default_year, years, models, datasets, stamps)
+
+
+def read_manifest(manifest_path: str = MANIFEST_PATH) -> tuple:
+    """
+    (default year, {year: {'model', 'default_round', 'rounds': {round: path}}})
+    with every path made absolute.
+    """
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    years = {}
+    for year, entry in manifest['years'].items():
+        rounds = {str(round): os.path.normpath(os.path.join(base, path)) for round, path in entry['rounds'].items()}
+        default_round = str(entry.get('default_round', next(iter(rounds))))
+        if default_round not in rounds:
+            raise ValueError(f"{year}: default round {default_round} is not listed")
+        model_path = os.path.normpath(os.path.join(base, entry['model']))
+        years[str(year)] = {'model': model_path, 'default_round': default_round, 'rounds': rounds}
+
+    default_year = str(manifest.get('default_year', next(iter(years))))
+    if default_year not in years:
+        raise ValueError(f"Default year {default_year} is not listed")
+    return default_year, years
+
+
+@functools.lru_cache(maxsize=8)
+def _manifest(manifest_path: str) -> tuple:
+    return read_manifest(manifest_path)
+
+
+@functools.lru_cache(maxsize=8)
+def _model(path: str) -> ExamModel:
+    return DEFAULT_MODEL if path == MODEL_PATH else ExamModel.load(path)
+
+
+def manifest_model(year=None, manifest_path: str = MANIFEST_PATH) -> ExamModel:
+    """
+    Conversion model for a year (default year if None) from the manifest alone,
+    without loading any dataset. Used by the Vercel /api/predict function; the
+    manifest and each model are read once per process.
+    """
+    default_year, years = _manifest(manifest_path)
+    year = default_year if year is None else str(year)
+    if year not in years:
+        raise ValueError(f"Unknown year: {year}")
+    return _model(years[year]['model'])
+
+
+class Registry:
+    """
+    Holds the current RegistrySnapshot. The first call to current() loads it;
+    later calls return it at once and, at most every poll_seconds, start a
+    background reload if any listed file changed. A failed reload is printed
+    and the previous snapshot stays in service.
+
+    current() loads only the models (no pandas import), which is all
+    predictions need; the first current(datasets=True) loads the JoSAA
+    datasets too, and from then on every reload includes them.
+
+    Those first loads are serialized by their own lock and run outside the
+    one _poll takes, so requests served meanwhile (from the ASGI event loop
+    too) never wait for the datasets.
+    """
+
+    def __init__(self, manifest_path: str = MANIFEST_PATH, poll_seconds: float = POLL_SECONDS, on_swap=None):
+        self.manifest_path = manifest_path
+        self.poll_seconds = poll_seconds
+        self.on_swap = on_swap
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._reloading = False
+        self._next_poll = 0.0
+        self._failed_stamps = None
+
+    def current(self, datasets: bool = False) -> RegistrySnapshot:
+        snapshot = self._snapshot
+        if snapshot is None or (datasets and snapshot.datasets is None):
+            with self._load_lock:
+                while True:
+                    previous = self._snapshot
+                    if previous is not None and (previous.datasets is not None or not datasets):
+                        return previous
+                    snapshot = load_registry(self.manifest_path, previous=previous, datasets=datasets)
+                    # A background reload may have swapped in meanwhile: load again on top of it
+                    with self._lock:
+                        if self._snapshot is previous:
+                            self._snapshot = snapshot
+                            self._next_poll = time.monotonic() + self.poll_seconds
+                            return snapshot
+        if self.poll_seconds >= 0 and time.monotonic() >= self._next_poll:
+            self._poll(snapshot)
+        return snapshot
+
+    def _poll(self, snapshot: RegistrySnapshot):
+        with self._lock:
+            if self._reloading or time.monotonic() < self._next_poll:
+                return
+            self._next_poll = time.monotonic() + self.poll_seconds
+            stamps = {path: _file_stamp(path) for path in snapshot.stamps}
+            if stamps == snapshot.stamps or stamps == self._failed_stamps:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload_in_background, args=(stamps,), daemon=True).start()
+
+    def _reload_in_background(self, stamps: dict):
+        try:
+            self.reload()
+            self._failed_stamps = None
+        except Exception as e:
+            print(f"Registry reload failed, keeping generation {self._snapshot.generation}: {e}")
+            self._failed_stamps = stamps
+        finally:
+            self._reloading = False
+
+    def reload(self) -> RegistrySnapshot:
+        """
+        Load the manifest again and swap the new snapshot in. The load runs
+        outside the lock; if another snapshot was installed meanwhile (the
+        datasets loaded by current(datasets=True)), the load is repeated on top
+        of it, reusing its unchanged files, so a swap never drops datasets.
+        """
+        while True:
+            previous = self._snapshot
+            snapshot = load_registry(self.manifest_path, previous=previous,
+                                     datasets=previous is None or previous.datasets is not None)
+            with self._lock:
+                if self._snapshot is previous:
+                    self._snapshot = snapshot
+                    break
+        print(f"Registry generation {snapshot.generation} loaded: {snapshot.stats()['years']}")
+        if self.on_swap is not None:
+            self.on_swap()
+        return snapshot
@@ -0,0 +1,211 @@
+import json
+import math
+
+import numpy as np
+
+from admission_chance import RANK_UNCERTAINTY, ROW_PREFIXES, admission_permille, cutoff_variance
+from college_filters import CollegeQuery, FilterIndex
+from snapshot import MISSING_RANK
+
+
+def _json_float(value: float) -> str:
+    if math.isnan(value):
+        return 'null'
+    return float.__repr__(value) if math.isfinite(value) else json.dumps(value)
+
+
+def _json_scalar(value) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return 'null'
+    return json.dumps(value.item() if hasattr(value, 'item') else value)
+
+
+def json_column(column) -> list:
+    """
+    JSON text of every value of a pandas column, with NaN/None as null.
+    Categorical and string columns encode each distinct value once.
+    """
+    kind = column.dtype.kind
+    if kind in 'iu':
+        return [str(value) for value in column.tolist()]
+    if kind == 'f':
+        return [_json_float(value) for value in column.tolist()]
+    if column.dtype.name == 'category':
+        # Code -1 (missing) picks the trailing null
+        encoded = [_json_scalar(value) for value in column.cat.categories.tolist()] + ['null']
+        return [encoded[code] for code in column.cat.codes.tolist()]
+
+    encoded = {}
+    result = []
+    for value in column.tolist():
+        try:
+            text = encoded[value]
+        except (KeyError, TypeError):
+            text = _json_scalar(value)
+            try:
+                encoded[value] = text
+            except TypeError:
+                pass
+        result.append(text)
+    return result
+
+
+def json_rows(frame) -> list:
+    """
+    Every row of a DataFrame as compact JSON object bytes with sorted keys
+    (same as json.dumps(record, sort_keys=True, separators=(',', ':')) with
+    NaN as null), built column by column without per-row dicts.
+    """
+    names = sorted(frame.columns)
+    template = '{' + ','.join(json.dumps(name) + ':%s' for name in names) + '}'
+    columns = [json_column(frame[name]) for name in names]
+    return [(template % values).encode() for values in zip(*columns)]
+
+
+def eligible_counts(closing_ranks: np.ndarray, thresholds: np.ndarray, codes: np.ndarray = None,
+                    groups: int = 1) -> np.ndarray:
+    """
+    Number of closing ranks >= each threshold, from one binary search per
+    threshold over the sorted ranks. With int codes (one per rank, -1 for
+    none) the counts are per code: a (groups, thresholds) array, computed in
+    the same single search by offsetting each code's ranks into its own span.
+    """
+    if codes is None:
+        ranks = np.sort(closing_ranks)
+        return len(ranks) - np.searchsorted(ranks, thresholds, side='left')
+
+    # Thresholds are clipped to [0, highest rank + 1] (same counts) so that no
+    # offset threshold leaves its code's span or outgrows float64 precision
+    keep = codes >= 0
+    top = float(closing_ranks.max(initial=0)) + 1
+    span = top + 1
+    keys = np.sort(codes[keep] * span + closing_ranks[keep])
+    starts = np.arange(groups)[:, None] * span
+    ends = np.searchsorted(keys, starts[:, 0] + span, side='left')
+    return ends[:, None] - np.searchsorted(keys, starts + np.clip(thresholds, 0, top), side='left')
+
+
+class CollegeList:
+    """
+    Rank-independent /api/colleges result for one (category, gender, state):
+    every row serialized to JSON once, in closing-rank order, with the
+    FilterIndex used for filtered and re-sorted requests and the closing rank
+    spreads the rank-dependent admission chances are computed from.
+
+    Rows are stored without their opening brace: each page prepends a
+    precomputed '{"Admission Band":...,"Admission Chance":...,' prefix.
+    """
+
+    __slots__ = ('bucket', 'rows', 'filters', 'log_closing', 'cutoff_variance', 'nbytes')
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+        self.rows = [row[1:] for row in json_rows(bucket.all_rows())]
+        frame = bucket.rows.iloc[bucket.positions]
+        self.filters = FilterIndex(frame)
+        opening = frame['Opening Rank'].to_numpy()
+        self.log_closing, self.cutoff_variance = cutoff_variance(
+            np.where(opening == MISSING_RANK, np.nan, opening), bucket.closing_ranks.astype(np.float64)
+        )
+        self.nbytes = (sum(len(row) for row in self.rows) + bucket.closing_ranks.nbytes + self.filters.nbytes
+                       + self.log_closing.nbytes + self.cutoff_variance.nbytes)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def select(self, category_rank: int, margin: float, offset: int = 0, limit: int = None,
+               query: CollegeQuery = None) -> tuple:
+        """
+        (positions, total, end) for a page of the eligible rows that match the
+        query: the row positions from `offset` on (at most limit), in order, the
+        number of matching rows and the offset just past the page. Positions are
+        a range without a query, else an int array.
+        """
+        start = self.bucket.start(category_rank, margin)
+        if query is None:
+            first = min(start + offset, len(self.rows))
+            stop = len(self.rows) if limit is None else min(first + limit, len(self.rows))
+            return range(first, stop), len(self.rows) - start, stop - start
+
+        selected = self.filters.select(start, query)
+        first = min(offset, len(selected))
+        stop = len(selected) if limit is None else min(first + limit, len(selected))
+        return selected[first:stop], len(selected), stop
+
+    def rows_at(self, positions, category_rank: int, rank_uncertainty: float = RANK_UNCERTAINTY) -> list:
+        """JSON rows at positions (from select) with the candidate's admission chance added."""
+        if isinstance(positions, range):
+            positions = slice(positions.start, positions.stop)
+            rows = self.rows[positions]
+        else:
+            rows = [self.rows[position] for position in positions.tolist()]
+
+        # One vectorized pass over the rows, then a precomputed prefix per row
+        permille = admission_permille(self.log_closing[positions], self.cutoff_variance[positions],
+                                      category_rank, rank_uncertainty)
+        return [ROW_PREFIXES[chance] + row for chance, row in zip(permille.tolist(), rows)]
+
+    def response_body(self, category_rank: int, margin: float, selection: tuple, offset: int = 0,
+                      paginated: bool = False, query: CollegeQuery = None,
+                      rank_uncertainty: float = RANK_UNCERTAINTY) -> bytes:
+        """
+        JSON body with the rows of a selection (from select) for a rank, as
+        returned by /api/colleges. A paginated body also has the page's offset,
+        the matching row total and the offset of the next page (null on the
+        last page). Facet counts are added when the query asks for them.
+        """
+        positions, total, end = selection
+        rows = self.rows_at(positions, category_rank, rank_uncertainty)
+        body = b'{"colleges":[' + b','.join(rows) + b']'
+        if query is not None and query.facets:
+            facets = self.filters.facet_counts(self.bucket.start(category_rank, margin), query)
+            body += b',"facets":' + json.dumps(facets, sort_keys=True, separators=(',', ':')).encode()
+        if not paginated:
+            return body + b',"success":true}'
+        next_offset = b'null' if end >= total else b'%d' % end
+        return body + b',"nextOffset":%s,"offset":%d,"success":true,"total":%d}' % (next_offset, offset, total)
+
+    def ndjson_chunks(self, category_rank: int, positions, chunk_rows: int = 100,
+                      rank_uncertainty: float = RANK_UNCERTAINTY):
+        """
+        The rows at positions (from select), one JSON object per line,
+        chunk_rows lines at a time. Each chunk's rows and admission chances
+        are built only as it is read.
+        """
+        for first in range(0, len(positions), chunk_rows):
+            rows = self.rows_at(positions[first:first + chunk_rows], category_rank, rank_uncertainty)
+            yield b'\n'.join(rows) + b'\n'
+
+    def curve(self, category_ranks: np.ndarray, margin: float, query: CollegeQuery = None,
+              group_by: str = None) -> dict:
+        """
+        Eligible rows (as the /api/colleges total) and eligible distinct
+        programs at every rank of a grid, optionally per value of a facet
+        field. A program is eligible while its highest closing rank is.
+        """
+        thresholds = margin * np.asarray(category_ranks, dtype=np.float64)
+        closing = self.bucket.closing_ranks.astype(np.float64)
+        program_ids = self.filters.program_ids
+        codes = None if group_by is None else self.filters.codes[group_by]
+        if query is not None:
+            mask = self.filters.mask(0, query)
+            closing, program_ids = closing[mask], program_ids[mask]
+            codes = None if codes is None else codes[mask]
+
+        # Closing ranks are sorted, so each program's last row has its highest
+        _, last = np.unique(program_ids[::-1], return_index=True)
+        last = len(program_ids) - 1 - last
+        curve = {
+            'eligible': eligible_counts(closing, thresholds).tolist(),
+            'programs': eligible_counts(closing[last], thresholds).tolist(),
+        }
+        if group_by is not None:
+            labels = self.filters.labels[group_by]
+            rows = eligible_counts(closing, thresholds, codes, len(labels))
+            programs = eligible_counts(closing[last], thresholds, codes[last], len(labels))
+            present = np.bincount(codes[codes >= 0], minlength=len(labels)) > 0
+            curve['groups'] = {
+                label: {'eligible': rows[i].tolist(), 'programs': programs[i].tolist()}
+                for i, label in enumerate(labels) if present[i]
+            }
+        return curve
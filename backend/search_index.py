@@ -0,0 +1,206 @@
+"""
+Inverted index over the institutes and academic programs of a JoSAA dataset,
+for /api/colleges searches such as "IIT Bombay CSE" or "electrical NIT".
+
+Documents are the distinct (Institute, Academic Program Name) pairs. A query
+is split into words; every word must match each document returned, by one of:
+- the same word (score 1.0)
+- an abbreviation in INSTITUTE_ALIASES / PROGRAM_ALIASES whose phrase
+  appears in the institute / program name (1.0)
+- a longer word it is a prefix of, for words of 3+ letters (0.9)
+- a similar word, for words of 4+ letters, to absorb typos such as "bombey":
+  candidates share a letter trigram, and similarity is the larger of their
+  trigram Dice coefficient and 1 - edits / length (counted when at most one
+  edit away, two for words of 8+ letters); it must be >= 0.6 (score 0.8 x
+  similarity)
+A document's score is the mean of its per-word scores.
+"""
+import bisect
+import functools
+import re
+
+import numpy as np
+
+# Abbreviation -> phrases it stands for, as whole words of the institute name
+INSTITUTE_ALIASES = {
+    'iit': ['indian institute of technology'],
+    'iiit': ['indian institute of information technology', 'international institute of information technology'],
+    'nit': ['national institute of technology'],
+    'iiest': ['indian institute of engineering science and technology'],
+    'bit': ['birla institute of technology'],
+    'spa': ['school of planning and architecture'],
+    'bhu': ['banaras hindu university'],
+    'ism': ['indian school of mines'],
+    'pec': ['punjab engineering college'],
+    'nitk': ['national institute of technology karnataka'],
+    'nitt': ['national institute of technology tiruchirappalli'],
+    'nitw': ['national institute of technology warangal'],
+    'vnit': ['visvesvaraya national institute of technology'],
+    'mnit': ['malaviya national institute of technology'],
+    'manit': ['maulana azad national institute of technology'],
+    'mnnit': ['motilal nehru national institute of technology'],
+    'svnit': ['sardar vallabhbhai national institute of technology'],
+    'trichy': ['tiruchirappalli'],
+}
+
+# ... and of the academic program name
+PROGRAM_ALIASES = {
+    'cse': ['computer science and engineering', 'computer science engineering'],
+    'cs': ['computer science'],
+    'ece': ['electronics and communication engineering'],
+    'ee': ['electrical engineering'],
+    'eee': ['electrical and electronics engineering'],
+    'me': ['mechanical engineering'],
+    'mech': ['mechanical engineering'],
+    'ce': ['civil engineering'],
+    'che': ['chemical engineering'],
+    'it': ['information technology'],
+    'ai': ['artificial intelligence'],
+    'ml': ['machine learning'],
+    'ds': ['data science'],
+    'mnc': ['mathematics and computing'],
+    'ep': ['engineering physics'],
+    'engg': ['engineering'],
+    'btech': ['bachelor of technology', 'b tech'],
+    'mtech': ['master of technology', 'm tech'],
+}
+
+# Words ignored in queries
+STOPWORDS = {'of', 'and', 'in', 'the', 'with', 'for', 'at'}
+
+MAX_QUERY_WORDS = 12
+PREFIX_SCORE = 0.9
+FUZZY_SCORE = 0.8
+# Minimum Dice similarity of trigram sets for a fuzzy match
+MIN_SIMILARITY = 0.6
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text) -> list:
+    return _WORD.findall(str(text).lower()) if isinstance(text, str) else []
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two words."""
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other)))
+        previous = current
+    return previous[-1]
+
+
+def _trigrams(word: str) -> set:
+    padded = f'${word}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Word postings, alias postings and a trigram index of the vocabulary."""
+
+    __slots__ = ('institutes', 'programs', 'postings', 'alias_postings', 'vocabulary', 'trigrams', 'gram_counts',
+                 'scores')
+
+    def __init__(self, institutes: list, programs: list):
+        self.institutes = list(institutes)
+        self.programs = list(programs)
+
+        postings = {}
+        phrase_texts = []
+        for document, (institute, program) in enumerate(zip(self.institutes, self.programs)):
+            words = tokenize(institute) + tokenize(program)
+            for word in set(words):
+                postings.setdefault(word, []).append(document)
+            # Padded with spaces so a phrase only matches whole words
+            phrase_texts.append((f" {' '.join(tokenize(institute))} ", f" {' '.join(tokenize(program))} "))
+        self.postings = {word: np.array(documents, dtype=np.int32) for word, documents in postings.items()}
+
+        self.alias_postings = {}
+        for field, aliases in enumerate([INSTITUTE_ALIASES, PROGRAM_ALIASES]):
+            for alias, phrases in aliases.items():
+                padded = [f' {phrase} ' for phrase in phrases]
+                documents = {
+                    document for document, texts in enumerate(phrase_texts)
+                    if any(phrase in texts[field] for phrase in padded)
+                }
+                documents.update(postings.get(alias, []))
+                self.alias_postings[alias] = np.array(sorted(documents), dtype=np.int32)
+
+        self.vocabulary = sorted(self.postings)
+        self.trigrams, self.gram_counts = {}, {}
+        for word in self.vocabulary:
+            if len(word) >= 3:
+                grams = _trigrams(word)
+                self.gram_counts[word] = len(grams)
+                for gram in grams:
+                    self.trigrams.setdefault(gram, []).append(word)
+
+        # Per-instance cache of query scores; the returned arrays are read-only
+        self.scores = functools.lru_cache(maxsize=1024)(self._scores)
+
+    def __len__(self) -> int:
+        return len(self.institutes)
+
+    def word_matches(self, word: str) -> dict:
+        """{vocabulary word or alias: score} for one query word."""
+        matches = {}
+        if len(word) >= 3:
+            start = bisect.bisect_left(self.vocabulary, word)
+            for candidate in self.vocabulary[start:]:
+                if not candidate.startswith(word):
+                    break
+                matches[candidate] = PREFIX_SCORE
+        if len(word) >= 4:
+            grams = _trigrams(word)
+            shared = {}
+            for gram in grams:
+                for candidate in self.trigrams.get(gram, ()):
+                    shared[candidate] = shared.get(candidate, 0) + 1
+            max_edits = 2 if len(word) >= 8 else 1
+            for candidate, count in shared.items():
+                similarity = 2 * count / (len(grams) + self.gram_counts[candidate])
+                if abs(len(candidate) - len(word)) <= max_edits:
+                    edits = edit_distance(word, candidate)
+                    if edits <= max_edits:
+                        similarity = max(similarity, 1 - edits / max(len(word), len(candidate)))
+                if similarity >= MIN_SIMILARITY:
+                    matches[candidate] = max(matches.get(candidate, 0), FUZZY_SCORE * similarity)
+        if word in self.postings:
+            matches[word] = 1.0
+        return matches
+
+    def _scores(self, text: str) -> np.ndarray:
+        """
+        Score of every document for a query (0 where some word does not
+        match), or None if the query has no words to search for.
+        """
+        words = list(dict.fromkeys(word for word in tokenize(text) if word not in STOPWORDS))
+        if not words:
+            return None
+        if len(words) > MAX_QUERY_WORDS:
+            raise ValueError(f"search must have at most {MAX_QUERY_WORDS} words")
+
+        total = np.zeros(len(self), dtype=np.float32)
+        matched = np.ones(len(self), dtype=bool)
+        for word in words:
+            best = np.zeros(len(self), dtype=np.float32)
+            for candidate, score in self.word_matches(word).items():
+                documents = self.postings[candidate]
+                best[documents] = np.maximum(best[documents], score)
+            if word in self.alias_postings:
+                best[self.alias_postings[word]] = 1.0
+            total += best
+            matched &= best > 0
+        scores = np.where(matched, total / len(words), 0).astype(np.float32)
+        scores.flags.writeable = False
+        return scores
+
+    def search(self, text: str, limit: int = 10) -> list:
+        """Best matching (institute, program, score) triples, highest score first."""
+        scores = self.scores(text)
+        if scores is None:
+            return []
+        order = np.argsort(-scores, kind='stable')[:limit]
+        return [(self.institutes[i], self.programs[i], float(scores[i])) for i in order if scores[i] > 0]
@@ -0,0 +1,110 @@
+"""
+Build the dependency-free college index served by the Vercel /api/colleges function.
+
+    python backend/serverless_index.py
+
+The file holds the same presorted (seat type, gender pool, home state) buckets
+as CollegeIndex for the registry's default year and round, and each row's log
+closing rank and cutoff variance (admission_chance.cutoff_variance), so
+api/colleges/index.py can answer with the standard library only, admission
+chances included. Re-run this whenever the JoSAA CSV, the eligibility rules or
+the admission chance model change.
+
+Layout (little-endian):
+    b'JOSAAIDX' | uint32 header length | JSON header | arrays listed in header['arrays']
+"""
+import json
+import os
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+from admission_chance import MODERATE_PERMILLE, PERMILLE_THRESHOLDS, SAFE_PERMILLE, cutoff_variance
+from college_index import CollegeIndex
+from registry import load_registry
+from snapshot import MISSING_RANK
+
+MAGIC = b'JOSAAIDX'
+FORMAT_VERSION = 2
+
+OUTPUT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api', 'colleges', 'josaa_2024.idx'
+)
+
+
+def _bucket_key(seat_type: str, gender: str, state: str) -> str:
+    return f"{seat_type}|{gender}|{state or ''}"
+
+
+def build_serverless_index(index: CollegeIndex, year: str, round: str, path: str = OUTPUT_PATH) -> str:
+    """Write the index of one dataset (JoSAA year and round) to path."""
+    strings = {}
+
+    def string_id(value) -> int:
+        return strings.setdefault(value, len(strings))
+
+    college, course, state = array('H'), array('H'), array('H')
+    closing_rank, salary = array('i'), array('d')
+    log_closing, variance = array('d'), array('d')
+    bucket_rows = array('H')
+    buckets = {}
+    row_offsets = {}
+
+    for (seat_type, gender, home_state), bucket in index.buckets.items():
+        # Buckets of one gender pool share their rows frame; write it once
+        offset = row_offsets.get(id(bucket.rows))
+        if offset is None:
+            offset = row_offsets[id(bucket.rows)] = len(closing_rank)
+            for record in bucket.rows.itertuples(index=False):
+                college.append(string_id(record[0]))
+                course.append(string_id(record[1]))
+                state.append(string_id(record[2]))
+                closing_rank.append(int(record[3]))
+                salary.append(float(record[4]))
+            opening = bucket.rows['Opening Rank'].to_numpy()
+            pool_log_closing, pool_variance = cutoff_variance(
+                np.where(opening == MISSING_RANK, np.nan, opening), bucket.rows['Closing Rank'].to_numpy(np.float64)
+            )
+            log_closing.extend(pool_log_closing.tolist())
+            variance.extend(pool_variance.tolist())
+
+        # Bucket entries are row positions relative to the start of their pool
+        buckets[_bucket_key(seat_type, gender, home_state)] = [offset, len(bucket_rows), len(bucket)]
+        bucket_rows.extend(int(position) for position in bucket.positions)
+
+    arrays = [
+        ('college', college), ('course', course), ('state', state),
+        ('closing_rank', closing_rank), ('salary', salary), ('bucket_rows', bucket_rows),
+        ('log_closing', log_closing), ('cutoff_variance', variance),
+    ]
+    header = {
+        'version': FORMAT_VERSION,
+        'year': year,
+        'round': round,
+        'strings': list(strings),
+        'home_states': list(index.home_states),
+        'buckets': buckets,
+        # Admission chances: Phi(z) in thousandths is the number of thresholds <= z
+        'permille_thresholds': PERMILLE_THRESHOLDS.tolist(),
+        'bands': [[SAFE_PERMILLE, 'safe'], [MODERATE_PERMILLE, 'moderate'], [0, 'reach']],
+        'arrays': [[name, values.typecode, len(values)] for name, values in arrays],
+    }
+    header_bytes = json.dumps(header, separators=(',', ':')).encode()
+
+    with open(path + '.tmp', 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes)
+        for _, values in arrays:
+            if sys.byteorder != 'little':
+                values = array(values.typecode, values)
+                values.byteswap()
+            values.tofile(f)
+    os.replace(path + '.tmp', path)
+    return path
+
+
+if __name__ == '__main__':
+    # The dataset /api/colleges serves when a request names no year or round
+    (year, round, *_), index = load_registry().dataset()
+    print(f"Wrote {build_serverless_index(index, year, round)}")
@@ -0,0 +1,130 @@
+"""
+Columnar binary snapshot of the JoSAA CSV for fast cold starts.
+
+Build it once (Render runs this in its build step):
+
+    python backend/snapshot.py
+
+The snapshot is a directory of .npy column files plus meta.json. String columns
+are dictionary-encoded (category codes + a string table), ranks are int32 with
+-1 for ranks that are not plain numbers, and salaries/tiers are float32. At startup
+the columns are memory-mapped instead of parsing CSV text, and the loaded
+DataFrame keeps them mapped: its columns are views of the files, so their pages
+are shared by every process that loads the same snapshot.
+"""
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 2
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots')
+
+RANK_COLUMNS = ['Opening Rank', 'Closing Rank']
+FLOAT_COLUMNS = ['Expected Salary', 'Salary Tier']
+MISSING_RANK = -1
+
+
+def snapshot_path(csv_path: str) -> str:
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(SNAPSHOT_DIR, name.replace(' ', '_'))
+
+
+def _source_stamp(csv_path: str) -> dict:
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Give a CSV's rank and salary columns the types of a loaded snapshot: ranks
+    int32 with MISSING_RANK where the rank is not a plain number, salaries and
+    tiers float32 (NaN where missing). Modifies and returns df.
+    """
+    for name in RANK_COLUMNS:
+        df[name] = pd.to_numeric(df[name], errors='coerce').fillna(MISSING_RANK).to_numpy(np.int32)
+    for name in FLOAT_COLUMNS:
+        df[name] = pd.to_numeric(df[name], errors='coerce').to_numpy(np.float32)
+    return df
+
+
+def build_snapshot(csv_path: str, path: str = None) -> str:
+    """Convert a JoSAA CSV into a snapshot directory and return its path."""
+    path = path or snapshot_path(csv_path)
+    os.makedirs(path, exist_ok=True)
+    df = coerce_numeric(pd.read_csv(csv_path))
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        file_name = f'{i:02d}.npy'
+        if name in RANK_COLUMNS:
+            values = df[name].to_numpy()
+            columns.append({'name': name, 'kind': 'rank', 'file': file_name})
+        elif name in FLOAT_COLUMNS:
+            values = df[name].to_numpy()
+            columns.append({'name': name, 'kind': 'float', 'file': file_name})
+        else:
+            # Codes are saved in the dtype pandas picks for them, so loading
+            # can wrap the mapped file without converting it
+            categorical = pd.Categorical(df[name])
+            values = categorical.codes
+            columns.append({
+                'name': name,
+                'kind': 'category',
+                'file': file_name,
+                'categories': [str(value) for value in categorical.categories],
+            })
+        np.save(os.path.join(path, file_name), values)
+
+    meta = {
+        'version': FORMAT_VERSION,
+        'source': os.path.basename(csv_path),
+        'source_stamp': _source_stamp(csv_path),
+        'rows': len(df),
+        'columns': columns,
+    }
+    # meta.json is written last, so a half-written snapshot is never loaded
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+    return path
+
+
+def load_snapshot(csv_path: str, path: str = None):
+    """
+    DataFrame for csv_path from its snapshot, with the column types of
+    coerce_numeric (ranks int32 with MISSING_RANK, salaries float32) and the
+    string columns categorical. Every column is a view of its memory-mapped
+    file, not a copy. Returns None if there is no snapshot or it was built
+    from a different version of the CSV.
+    """
+    path = path or snapshot_path(csv_path)
+    try:
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('version') != FORMAT_VERSION or meta.get('source_stamp') != _source_stamp(csv_path):
+        return None
+
+    data = {}
+    for column in meta['columns']:
+        values = np.load(os.path.join(path, column['file']), mmap_mode='r')
+        if column['kind'] == 'category':
+            # The codes were written by build_snapshot; validating them would copy
+            data[column['name']] = pd.Categorical.from_codes(values, column['categories'], validate=False)
+        else:
+            data[column['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+if __name__ == '__main__':
+    from registry import read_manifest
+
+    # Default: every JoSAA dataset listed in the registry manifest
+    _, years = read_manifest()
+    sources = sys.argv[1:] or sorted({path for entry in years.values() for path in entry['rounds'].values()})
+    for source in sources:
+        print(f"Wrote {build_snapshot(source)}")
@@ -0,0 +1,94 @@
+"""
+Confidence intervals for the percentile, AIR and category rank of a prediction.
+
+Each stage of the conversion chain after the input is treated as uncertain,
+with the spreads in the model's `uncertainty` table:
+- percentage -> percentile: 100 - percentile is log-normal around the model
+  value (sd `percentile_tail`), so the error shrinks near the top
+- percentile <-> AIR: the number of test takers is normal (relative sd `test_takers`)
+- AIR <-> category rank: the category rank is log-normal around the category
+  model (sd `category_rank`); OPEN ranks are exact
+The chain is evaluated once per Monte Carlo sample with the vectorized
+functions and the intervals are sample quantiles. The samples are a fixed set
+of standard normal draws (SAMPLES per stage) drawn once, which bounds the work
+per request and makes the same request always give the same intervals.
+"""
+import os
+
+import numpy as np
+
+import vectorized
+
+# Monte Carlo samples per request (the per-request compute budget)
+SAMPLES = int(os.environ.get('UNCERTAINTY_SAMPLES', 2048))
+
+DEFAULT_CONFIDENCE = 0.9
+
+# One row of standard normal draws per stage: percentile, test takers, category rank
+_DRAWS = np.random.default_rng(2024).standard_normal((3, SAMPLES))
+
+
+def _interval(samples: np.ndarray, confidence: float) -> np.ndarray:
+    tail = (1 - confidence) / 2
+    return np.quantile(samples[~np.isnan(samples)], [tail, 1 - tail])
+
+
+def _rank_interval(samples: np.ndarray, confidence: float) -> list:
+    low, high = np.rint(_interval(samples, confidence)).astype(np.int64).tolist()
+    return [max(low, 1), max(high, 1)]
+
+
+def prediction_intervals(category: str, input_type: str, results: dict, model,
+                         confidence: float = DEFAULT_CONFIDENCE) -> dict:
+    """
+    {'confidence', 'percentile': [low, high], 'allIndiaRank': [low, high],
+    'categoryRank': [low, high], 'rankUncertainty'} around the point results
+    of predict_results. The input's own field has a zero-width interval.
+    rankUncertainty is the sd of log category rank over the samples, the
+    /api/colleges rankUncertainty for this prediction.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    spread = model.uncertainty
+    percentile_draw, takers_draw, category_draw = _DRAWS
+    test_takers = model.test_takers * (1 + spread['test_takers'] * takers_draw)
+    category_model = model.category_models.get(category)
+
+    def air_to_cat(air):
+        if category_model is None:
+            return air
+        return vectorized.evaluate(category_model, air) * np.exp(spread['category_rank'] * category_draw)
+
+    with np.errstate(all='ignore'):
+        if input_type in ('marks', 'percentage', 'percentile'):
+            percentile = np.full(SAMPLES, float(results['percentile']))
+            if input_type != 'percentile':
+                percentile = 100 - (100 - percentile) * np.exp(spread['percentile_tail'] * percentile_draw)
+                percentile = np.maximum(percentile, 0)
+            air = test_takers * (1 - percentile / 100)
+            cat = air_to_cat(air)
+        elif input_type == 'allIndiaRank':
+            air = np.full(SAMPLES, float(results['allIndiaRank']))
+            percentile = 100 * (1 - air / test_takers)
+            cat = air_to_cat(air)
+        else:
+            cat = np.full(SAMPLES, float(results['categoryRank']))
+            if category_model is None:
+                air = cat
+            else:
+                air = vectorized.inverse(category_model, cat * np.exp(-spread['category_rank'] * category_draw))
+            percentile = 100 * (1 - air / test_takers)
+
+        # The top of the scale (AIR 1) stays exact
+        if float(results['percentile']) >= 100:
+            percentile, air, cat = np.full(SAMPLES, 100.0), np.ones(SAMPLES), np.ones(SAMPLES)
+        log_cat = np.log(np.maximum(cat, 1))
+
+    low, high = _interval(np.clip(percentile, 0, 100), confidence).tolist()
+    return {
+        'confidence': confidence,
+        'percentile': [round(low, 5), round(high, 5)],
+        'allIndiaRank': _rank_interval(air, confidence),
+        'categoryRank': _rank_interval(cat, confidence),
+        'rankUncertainty': round(float(np.nanstd(log_cat)), 5),
+    }
@@ -0,0 +1,263 @@
+"""
+NumPy array-in/array-out versions of the conversion chain in prediction.py.
+
+Percentile functions evaluate all segments on the whole array and pick per
+element with np.select, in the same order as the scalar if/elif ladders; the
+category rank models look up each element's segment with np.searchsorted.
+After the same rounding, results are identical to the scalar functions for
+finite inputs.
+"""
+import numpy as np
+
+import prediction as p
+
+# ============================
+# Rounding
+# ============================
+
+def round_half_even(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    Python round(x, digits) for arrays. np.round scales by 10**digits before
+    rounding, which can land on the other side of a .5 tie than round() does,
+    and is off by an ulp once the scaled value is too large to be exact; the
+    few elements that sit on a tie or are that large are rounded with round()
+    itself.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, digits)
+    scaled = values * 10.0 ** digits
+    inexact = (np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6) | (np.abs(scaled) >= 2.0 ** 52)
+    if inexact.any():
+        rounded[inexact] = [round(value, digits) for value in values[inexact].tolist()]
+    return rounded
+
+def to_int(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    int(x) for arrays of whole numbers. Clears valid (in place) where x is NaN
+    or too large for int64, which the scalar chain turns into an error or a
+    Python int; those elements are 0.
+    """
+    fits = np.abs(values) < 2.0 ** 63
+    valid &= fits
+    return np.where(fits, values, 0).astype(np.int64)
+
+# ============================
+# Basic Conversion Functions
+# ============================
+
+def marks_to_percentage(score: np.ndarray, total: int = p.TOTAL_MARKS) -> np.ndarray:
+    return np.asarray(score, dtype=np.float64) * 100 / total
+
+def percentage_to_marks(percentage: np.ndarray, total: int = p.TOTAL_MARKS) -> np.ndarray:
+    return np.floor(np.asarray(percentage, dtype=np.float64) * total / 100).astype(np.int64)
+
+def _logistic(percentage: np.ndarray, curve: p.PercentileCurve) -> np.ndarray:
+    growth = np.exp(-curve.logistic_k * (percentage - curve.logistic_x0))
+    # NaN where math.exp overflows (the scalar version raises OverflowError)
+    return np.where(np.isinf(growth), np.nan, curve.logistic_l + (curve.logistic_u - curve.logistic_l) / (1 + growth))
+
+def percentage_to_percentile(percentage: np.ndarray, model: p.ExamModel = None) -> np.ndarray:
+    """NaN where the scalar percentage_to_percentile raises OverflowError."""
+    curve = (model or p.DEFAULT_MODEL).percentile_curve
+    percentage = np.asarray(percentage, dtype=np.float64)
+    with np.errstate(all='ignore'):
+        return np.select(
+            [percentage <= curve.logistic_upper, percentage <= curve.log_upper],
+            [
+                _logistic(percentage, curve),
+                curve.log_intercept + curve.log_slope * np.log(percentage),
+            ],
+            100 * (1 - np.exp(-curve.exp_rate * percentage)),
+        )
+
+def percentile_to_percentage(percentile: np.ndarray, model: p.ExamModel = None) -> np.ndarray:
+    curve = (model or p.DEFAULT_MODEL).percentile_curve
+    percentile = np.asarray(percentile, dtype=np.float64)
+    with np.errstate(all='ignore'):
+        logistic = curve.logistic_x0 - np.log(
+            (curve.logistic_u - curve.logistic_l) / (percentile - curve.logistic_l) - 1
+        ) / curve.logistic_k
+        return np.select(
+            [
+                percentile <= curve.logistic_l,
+                percentile <= curve.logistic_top,
+                percentile <= curve.log_top,
+                percentile >= 100,
+            ],
+            [
+                0.0,
+                np.minimum(np.maximum(logistic, 0.0), curve.logistic_upper),
+                np.exp((percentile - curve.log_intercept) / curve.log_slope),
+                100.0,
+            ],
+            -np.log(1 - percentile / 100) / curve.exp_rate,
+        )
+
+def percentile_to_air(percentile: np.ndarray, model: p.ExamModel = None) -> np.ndarray:
+    """Returns floats holding whole numbers (see to_int)."""
+    test_takers = (model or p.DEFAULT_MODEL).test_takers
+    return np.trunc(test_takers * (1 - np.asarray(percentile, dtype=np.float64) / 100))
+
+def air_to_percentile(air: np.ndarray, model: p.ExamModel = None) -> np.ndarray:
+    return 100 * (1 - np.asarray(air, dtype=np.float64) / (model or p.DEFAULT_MODEL).test_takers)
+
+# ============================
+# AIR <-> Category Rank
+# ============================
+
+def _segment_index(bounds: list, inclusive: list, values: np.ndarray) -> np.ndarray:
+    """Segment of each value (np.searchsorted version of PiecewiseModel._find)."""
+    if not bounds:
+        return np.zeros(values.shape, dtype=np.intp)
+    bounds = np.asarray(bounds)
+    index = np.searchsorted(bounds, values, side='left')
+    at_bound = np.minimum(index, len(bounds) - 1)
+    exclusive = (index < len(bounds)) & (values == bounds[at_bound]) & ~np.asarray(inclusive)[at_bound]
+    return index + exclusive
+
+def evaluate(model, x: np.ndarray) -> np.ndarray:
+    """PiecewiseModel.evaluate for arrays."""
+    x = np.asarray(x, dtype=np.float64)
+    index = _segment_index(model.uppers, model.inclusive, x)
+    quadratic = np.take(model.quadratics, index)
+    slope = np.take(model.slopes, index)
+    intercept = np.take(model.intercepts, index)
+    return np.where(quadratic != 0, quadratic * (x ** 2) + slope * x + intercept, slope * x + intercept)
+
+def inverse(model, y: np.ndarray) -> np.ndarray:
+    """PiecewiseModel.inverse for arrays. NaN where the scalar version raises ValueError."""
+    y = np.asarray(y, dtype=np.float64)
+    index = _segment_index(model.y_uppers, model.inclusive, y)
+    quadratic = np.take(model.quadratics, index)
+    slope = np.take(model.slopes, index)
+    intercept = np.take(model.intercepts, index)
+    with np.errstate(all='ignore'):
+        x = (y - intercept) / slope
+
+        if any(model.quadratics):
+            # Quadratic segments: take the root that lies inside the segment
+            c = intercept - y
+            sqrt_disc = np.sqrt(slope * slope - 4.0 * quadratic * c)
+            x1 = (-slope + sqrt_disc) / (2.0 * quadratic)
+            x2 = (-slope - sqrt_disc) / (2.0 * quadratic)
+            lower = np.take([-np.inf] + model.uppers, index)
+            lower_open = np.take([True] + model.inclusive, index)
+            upper = np.take(model.uppers + [np.inf], index)
+            upper_closed = np.take(model.inclusive + [True], index)
+
+            def in_segment(root):
+                return (np.where(lower_open, root > lower, root >= lower)
+                        & np.where(upper_closed, root <= upper, root < upper))
+
+            roots = np.where(in_segment(x1), x1, np.where(in_segment(x2), x2, np.nan))
+            x = np.where(quadratic != 0, roots, x)
+
+    if model.y_min is not None:
+        x = np.where(y < model.y_min, np.nan, x)
+    return x
+
+def air_to_cat(category: str, rank: np.ndarray, model: p.ExamModel = None) -> np.ndarray:
+    """Convert All India Ranks to Category Ranks. Returns floats holding whole numbers (see to_int)."""
+    rank = np.asarray(rank, dtype=np.float64)
+    category_models = (model or p.DEFAULT_MODEL).category_models
+    if category == "OPEN":
+        raw = rank
+    elif category in category_models:
+        raw = evaluate(category_models[category], rank)
+    else:
+        raise ValueError("Invalid category")
+
+    rounded = np.rint(raw)
+    return np.where(rounded <= 0, 1.0, rounded)
+
+def cat_to_air(category: str, rank: np.ndarray, model: p.ExamModel = None) -> np.ndarray:
+    """
+    Convert Category Ranks to All India Ranks. Returns floats holding whole
+    numbers, with NaN where the scalar cat_to_air raises ValueError.
+    """
+    rank = np.asarray(rank, dtype=np.float64)
+    category_models = (model or p.DEFAULT_MODEL).category_models
+    if category == "OPEN":
+        raw = rank
+    elif category in category_models:
+        raw = inverse(category_models[category], rank)
+    else:
+        raise ValueError("Invalid category")
+
+    rounded = np.rint(raw)
+    return np.where(rounded < 0, 1.0, rounded)
+
+# ============================
+# Prediction
+# ============================
+
+def predict_results(category: str, input_type: str, input_value: np.ndarray, model: p.ExamModel = None) -> dict:
+    """
+    Array version of prediction.predict_results for finite input values.
+    Returns a dict of arrays (marks, percentage, percentile, allIndiaRank,
+    categoryRank) plus 'valid', False where the scalar version raises or
+    returns a rank too large for int64; other fields are meaningless there.
+    Raises ValueError for an invalid category or input type.
+    """
+    model = model or p.DEFAULT_MODEL
+    if not model.has_category(category):
+        raise ValueError("Invalid category")
+    value = np.asarray(input_value, dtype=np.float64)
+    valid = np.ones(value.shape, dtype=bool)
+
+    if input_type == 'marks':
+        value = np.maximum(value, 0)
+        top = value >= 300
+        marks = np.trunc(value).astype(np.int64)
+        percentage = round_half_even(marks_to_percentage(value), 2)
+        percentile = round_half_even(percentage_to_percentile(percentage, model), 5)
+        air = percentile_to_air(percentile, model)
+        cat = air_to_cat(category, air, model)
+        # Edge case: 300 marks = 100 percentile, AIR = 1
+        marks[top], percentage[top], percentile[top], air[top], cat[top] = 300, 100.0, 100.0, 1, 1
+
+    elif input_type == 'percentage':
+        top = value >= 100
+        percentage = round_half_even(value, 2)
+        marks = percentage_to_marks(value)
+        percentile = round_half_even(percentage_to_percentile(value, model), 5)
+        air = percentile_to_air(percentile, model)
+        cat = air_to_cat(category, air, model)
+        # Edge case: 100 percentage = 100 percentile, AIR = 1
+        marks[top], percentage[top], percentile[top], air[top], cat[top] = 300, 100.0, 100.0, 1, 1
+
+    elif input_type == 'percentile':
+        percentile = round_half_even(value, 5)
+        percentage = round_half_even(percentile_to_percentage(value, model), 2)
+        marks = percentage_to_marks(percentage)
+        air = percentile_to_air(value, model)
+        cat = air_to_cat(category, air, model)
+
+    elif input_type == 'allIndiaRank':
+        air = np.trunc(value)
+        percentile = round_half_even(air_to_percentile(air, model), 5)
+        percentage = round_half_even(percentile_to_percentage(percentile, model), 2)
+        marks = percentage_to_marks(percentage)
+        cat = air_to_cat(category, air, model)
+
+    elif input_type == 'categoryRank':
+        cat = np.trunc(value)
+        air = cat_to_air(category, cat, model)
+        valid = ~np.isnan(air)
+        air = np.where(valid, air, 0)
+        percentile = round_half_even(air_to_percentile(air, model), 5)
+        percentage = round_half_even(percentile_to_percentage(percentile, model), 2)
+        marks = percentage_to_marks(percentage)
+
+    else:
+        raise ValueError(f"Invalid input type: {input_type}")
+
+    valid &= ~np.isnan(percentile)
+    return {
+        'marks': marks,
+        'percentage': percentage,
+        'percentile': percentile,
+        'allIndiaRank': to_int(air, valid),
+        'categoryRank': to_int(cat, valid),
+        'valid': valid,
+    }
@@ -0,0 +1,164 @@
+"""
+Load test: the gunicorn (sync workers) setup versus the ASGI app under uvicorn.
+
+Both servers get the same number of worker processes. A fixed number of
+concurrent clients send a mix of /api/predict and /api/colleges requests for
+a set time; the test reports requests/sec and latency percentiles. The
+"slow clients" round adds connections that trickle their request body in a
+byte at a time, which is what ties up sync workers on a busy result day.
+
+Usage: python benchmarks/bench_asgi_load.py [--workers N] [--concurrency N]
+                                            [--seconds S] [--slow-clients N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CATEGORIES = ['OPEN', 'OBC-NCL', 'SC', 'ST', 'EWS']
+STATES = ['Maharashtra', 'Delhi', 'Karnataka', 'Tamil Nadu', 'Uttar Pradesh', 'Goa', 'Kerala', 'Bihar']
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def server_command(server: str, port: int, workers: int) -> list:
+    if server == 'gunicorn':
+        return [sys.executable, '-m', 'gunicorn', '--config', 'backend/gunicorn.conf.py', '--chdir', 'backend',
+                '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--log-level', 'warning', 'app:app']
+    return [sys.executable, '-m', 'uvicorn', '--app-dir', 'backend', '--host', '127.0.0.1', '--port', str(port),
+            '--workers', str(workers), '--log-level', 'warning', '--no-access-log', 'asgi:app']
+
+
+def request_bytes(rng: random.Random) -> bytes:
+    category = rng.choice(CATEGORIES)
+    if rng.random() < 0.5:
+        path = '/api/predict'
+        payload = {'category': category, 'inputType': 'percentile', 'inputValue': rng.uniform(50, 100)}
+    else:
+        path = '/api/colleges'
+        payload = {'category': category, 'categoryRank': rng.randint(1, 100000),
+                   'gender': rng.choice(['Male', 'Female']), 'state': rng.choice(STATES)}
+    body = json.dumps(payload).encode()
+    return (f'POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n').encode() + body
+
+
+async def fetch(port: int, data: bytes) -> int:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(data)
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    return int(response.split(b' ', 2)[1])
+
+
+async def slow_client(port: int, until: float):
+    """Sends one request, a body byte every 100 ms, until the test ends."""
+    body = b' ' * 10000
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write((f'POST /api/predict HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+                      f'Content-Length: {len(body)}\r\n\r\n').encode())
+        for byte in body:
+            if time.perf_counter() >= until:
+                break
+            writer.write(bytes([byte]))
+            await writer.drain()
+            await asyncio.sleep(0.1)
+    except OSError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_load(port: int, concurrency: int, seconds: float, slow_clients: int) -> dict:
+    until = time.perf_counter() + seconds
+    latencies, errors = [], 0
+
+    async def client(seed: int):
+        nonlocal errors
+        rng = random.Random(seed)
+        while time.perf_counter() < until:
+            start = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(fetch(port, request_bytes(rng)), timeout=30)
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                status = None
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    slow = [asyncio.create_task(slow_client(port, until)) for _ in range(slow_clients)]
+    await asyncio.sleep(0.2 if slow_clients else 0)
+    started = time.perf_counter()
+    await asyncio.gather(*(client(seed) for seed in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    for task in slow:
+        task.cancel()
+
+    latencies.sort()
+
+    def percentile(q: float) -> float:
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000 if latencies else float('nan')
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99),
+        'max_ms': latencies[-1] * 1000 if latencies else float('nan'),
+    }
+
+
+def measure(server: str, workers: int, concurrency: int, seconds: float, slow_clients: int) -> dict:
+    port = free_port()
+    process = subprocess.Popen(server_command(server, port, workers), cwd=ROOT_DIR,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(600):
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health').read()
+                break
+            except OSError:
+                time.sleep(0.1)
+        asyncio.run(run_load(port, concurrency, 1.0, 0))  # warm caches in every worker
+        return asyncio.run(run_load(port, concurrency, seconds, slow_clients))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--slow-clients', type=int, default=4)
+    args = parser.parse_args()
+
+    for slow_clients in sorted({0, args.slow_clients}):
+        print(f"{args.concurrency} clients, {slow_clients} slow clients, {args.workers} workers")
+        for server in ['gunicorn', 'uvicorn']:
+            r = measure(server, args.workers, args.concurrency, args.seconds, slow_clients)
+            print(f"  {server:<9} {r['rps']:7.0f} req/s  p50 {r['p50_ms']:7.1f} ms  p99 {r['p99_ms']:8.1f} ms  "
+                  f"max {r['max_ms']:8.1f} ms  ({r['requests']} ok, {r['errors']} errors)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Cost of a college availability curve: one /api/colleges/curve request for a
+rank grid, next to one /api/colleges request per grid rank (the only way to
+get the same counts before the endpoint), both through the in-process Flask
+client with the college list already cached.
+
+Usage: python benchmarks/bench_college_curve.py [--repeat N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from app import app  # noqa: E402
+from timing import best_ms  # noqa: E402
+
+CANDIDATE = {'category': 'OBC-NCL', 'gender': 'Female', 'state': 'Maharashtra'}
+
+# (label, grid fields)
+GRIDS = [
+    ('201 ranks', {'minRank': 1, 'maxRank': 200000, 'step': 1000}),
+    ('2,001 ranks', {'minRank': 1, 'maxRank': 200000, 'step': 100}),
+    ('200,000 ranks', {'minRank': 1, 'maxRank': 200000, 'step': 1}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    client = app.test_client()
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.post('/api/colleges', json=dict(CANDIDATE, categoryRank=1000))
+        per_rank = best_ms(lambda: client.post('/api/colleges', json=dict(CANDIDATE, categoryRank=50000, limit=1)),
+                           args.repeat * 10)
+    print(f"one /api/colleges request: {per_rank:.3f} ms")
+
+    print(f"{'grid':<15} {'curve':>10} {'by salary tier':>15} {'per-rank requests':>18}")
+    for label, grid in GRIDS:
+        body = dict(CANDIDATE, **grid)
+        points = (grid['maxRank'] - grid['minRank']) // grid['step'] + 1
+        plain = best_ms(lambda: client.post('/api/colleges/curve', json=body), args.repeat)
+        grouped = best_ms(lambda: client.post('/api/colleges/curve', json=dict(body, groupBy='salaryTier')),
+                          args.repeat)
+        print(f"{label:<15} {plain:8.2f}ms {grouped:13.2f}ms {per_rank * points:16.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
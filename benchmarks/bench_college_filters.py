@@ -0,0 +1,98 @@
+"""
+Benchmark the vectorized gender / home-state quota filters in get_colleges
+against the original per-college loops, on the bundled JoSAA 2024 CSV.
+
+Usage: python benchmarks/bench_college_filters.py [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from college_index import filter_gender_pool, filter_state_quota  # noqa: E402
+from registry import Registry  # noqa: E402
+
+CATEGORIES = ['OPEN', 'OBC-NCL', 'SC', 'ST', 'EWS']
+
+
+def legacy_filters(df: pd.DataFrame, gender: str, state: str) -> pd.DataFrame:
+    """The per-college loops get_colleges used before vectorization."""
+    if gender == 'Male':
+        df = df[df['Gender'] == 'Gender-Neutral']
+    else:
+        filtered_dfs = []
+        for college_id in df['College ID'].unique():
+            college_df = df[df['College ID'] == college_id]
+            female_only_df = college_df[college_df['Gender'].str.contains('Female-only', na=False)]
+            filtered_dfs.append(female_only_df if len(female_only_df) > 0 else college_df)
+        df = pd.concat(filtered_dfs, ignore_index=True) if filtered_dfs else pd.DataFrame()
+
+    filtered_dfs = []
+    for college_id in df['College ID'].unique():
+        college_df = df[df['College ID'] == college_id]
+        college_state = college_df['State'].iloc[0] if len(college_df) > 0 else None
+        if college_state == state:
+            quota_filter = college_df['Quota'].isin(['HS', 'AI'])
+            if state == 'Goa':
+                quota_filter = college_df['Quota'].isin(['HS', 'AI', 'GO'])
+            elif state == 'Jammu and Kashmir':
+                quota_filter = college_df['Quota'].isin(['HS', 'AI', 'JK', 'LA'])
+            filtered_college_df = college_df[quota_filter]
+        else:
+            filtered_college_df = college_df[college_df['Quota'].isin(['OS', 'AI'])]
+        if len(filtered_college_df) > 0:
+            filtered_dfs.append(filtered_college_df)
+    return pd.concat(filtered_dfs, ignore_index=True) if filtered_dfs else pd.DataFrame()
+
+
+def vectorized_filters(df: pd.DataFrame, gender: str, state: str) -> pd.DataFrame:
+    return filter_state_quota(filter_gender_pool(df, gender), state)
+
+
+def row_keys(df: pd.DataFrame) -> list:
+    columns = ['College ID', 'Academic Program Name', 'Quota', 'Gender', 'Closing Rank']
+    return sorted(map(tuple, df[columns].astype(str).values.tolist()))
+
+
+def run(filters, partitions, states, gender, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in partitions:
+            for state in states:
+                filters(frame, gender, state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    _, index = Registry().current(datasets=True).dataset()
+    jee_main = index.df[index.df['Entrance Test'] == 'JEE Main']
+    partitions = [jee_main[jee_main['Seat Type'] == category] for category in CATEGORIES]
+    states = sorted(index.df['State'].dropna().unique()) + ['Ladakh']
+
+    for gender in ['Male', 'Female']:
+        for frame in partitions:
+            for state in states:
+                assert row_keys(legacy_filters(frame, gender, state)) == \
+                    row_keys(vectorized_filters(frame, gender, state)), (gender, state)
+
+        calls = len(partitions) * len(states)
+        legacy = run(legacy_filters, partitions, states, gender, args.repeat)
+        vectorized = run(vectorized_filters, partitions, states, gender, args.repeat)
+        print(f"{gender:<6} {calls} category x state requests: "
+              f"loops {legacy * 1000 / calls:.2f} ms/request, "
+              f"vectorized {vectorized * 1000 / calls:.2f} ms/request, "
+              f"speedup {legacy / vectorized:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Time to first byte and peak memory of one /api/colleges request, for the full
+JSON body, a 50-row page and the NDJSON stream, at ranks with large and small
+result sets (warm response cache, in-process Flask client).
+
+Peak memory is the tracemalloc peak while the request runs and its body is
+read chunk by chunk.
+
+Usage: python benchmarks/bench_college_pages.py [--repeat N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from app import app  # noqa: E402
+
+QUERY = {'category': 'OPEN', 'gender': 'Male', 'state': 'Jharkhand'}
+
+MODES = {
+    'full JSON': ({}, {}),
+    'page of 50': ({'limit': 50}, {}),
+    'NDJSON': ({}, {'Accept': 'application/x-ndjson'}),
+    'NDJSON+gzip': ({}, {'Accept': 'application/x-ndjson', 'Accept-Encoding': 'gzip'}),
+}
+
+
+def request_once(client, payload: dict, headers: dict) -> tuple:
+    """(ms to first body chunk, total bytes, peak KB allocated)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        response = client.post('/api/colleges', json=payload, headers=headers, buffered=False)
+        chunks = iter(response.response)
+        first = next(chunks, b'')
+        first_byte = time.perf_counter() - start
+        size = len(first) + sum(len(chunk) for chunk in chunks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    response.close()
+    return first_byte * 1000, size, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    client = app.test_client()
+    for rank in [1, 40000]:
+        for label, (extra, headers) in MODES.items():
+            payload = dict(QUERY, categoryRank=rank, **extra)
+            request_once(client, payload, headers)  # fill the response cache
+            samples = [request_once(client, payload, headers) for _ in range(args.repeat)]
+            ttfb = sorted(sample[0] for sample in samples)[len(samples) // 2]
+            print(f"rank {rank:>6}  {label:<12} first byte {ttfb:6.3f} ms  "
+                  f"body {samples[0][1]:>7} B  peak {max(sample[2] for sample in samples):7.1f} KB")
+
+
+if __name__ == '__main__':
+    main()
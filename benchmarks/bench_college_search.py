@@ -0,0 +1,63 @@
+"""
+Search over institutes and academic programs: time to build the SearchIndex,
+to score a query against it (uncached and cached), and to answer a
+/api/colleges request with a search, next to a substring scan of the
+Institute and Academic Program Name strings of the JoSAA table.
+
+Usage: python benchmarks/bench_college_search.py [--repeat N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from app import app, registry  # noqa: E402
+from search_index import SearchIndex, tokenize  # noqa: E402
+from timing import best_ms  # noqa: E402
+
+QUERIES = ['IIT Bombay CSE', 'electrical NIT', 'nit surathkal electrcal', 'iiit allahabad it',
+           'mechanicl', 'data science', 'vnit mech', 'computr science nit']
+
+REQUEST = {'category': 'OPEN', 'categoryRank': 5000, 'gender': 'Male', 'state': 'Maharashtra'}
+
+
+def scan(df, query: str):
+    # Every query word as a substring of the institute or program name (no aliases or typos)
+    text = (df['Institute'].astype(str) + ' ' + df['Academic Program Name'].astype(str)).str.lower()
+    mask = None
+    for word in tokenize(query):
+        matches = text.str.contains(word, regex=False)
+        mask = matches if mask is None else mask & matches
+    return df[mask]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    index = registry.current(datasets=True).dataset()[1]
+    search = index.search
+    build = best_ms(lambda: SearchIndex(search.institutes, search.programs), max(1, args.repeat // 10))
+    print(f"SearchIndex build: {build:.1f} ms for {len(search)} institute/program pairs, "
+          f"{len(search.vocabulary)} words")
+
+    client = app.test_client()
+    print(f"{'query':<26} {'matches':>7} {'score':>9} {'cached':>9} {'request':>9} {'CSV scan':>9}")
+    for query in QUERIES:
+        uncached = best_ms(lambda: search._scores(query), args.repeat)
+        cached = best_ms(lambda: search.scores(query), args.repeat)
+        matches = int((search.scores(query) > 0).sum())
+        payload = dict(REQUEST, search=query)
+        with contextlib.redirect_stdout(io.StringIO()):
+            client.post('/api/colleges', json=payload)
+            request_ms = best_ms(lambda: client.post('/api/colleges', json=payload), args.repeat)
+        scan_ms = best_ms(lambda: scan(index.df, query), max(1, args.repeat // 10))
+        print(f"{query:<26} {matches:>7} {uncached:7.3f}ms {cached:7.4f}ms {request_ms:7.3f}ms {scan_ms:7.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
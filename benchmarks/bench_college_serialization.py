@@ -0,0 +1,89 @@
+"""
+Time to serialize college rows to JSON: the old to_dict('records') + NaN
+scrubbing loop + jsonify path, per-record json.dumps over the same dicts,
+and the column-wise encoder in response_cache.json_rows.
+
+Runs on the largest result set the 2024 CSV can produce (the biggest
+category/gender/state list at rank 1) and on every list of the dataset, and
+checks that all three paths give the same parsed rows.
+
+Usage: python benchmarks/bench_college_serialization.py [--repeat N]
+"""
+import argparse
+import json
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from flask import Flask, jsonify  # noqa: E402
+
+from college_index import CollegeIndex, CSV_PATH  # noqa: E402
+from response_cache import json_rows  # noqa: E402
+from timing import best_ms  # noqa: E402
+
+flask_app = Flask(__name__)
+
+
+def scrubbed_records(frame) -> list:
+    records = frame.to_dict('records')
+    for record in records:
+        for key, value in record.items():
+            if isinstance(value, float) and math.isnan(value):
+                record[key] = None
+    return records
+
+
+def legacy(frame) -> bytes:
+    with flask_app.app_context():
+        return jsonify(scrubbed_records(frame)).get_data()
+
+
+def per_record(frame) -> bytes:
+    rows = [json.dumps(record, sort_keys=True).encode() for record in scrubbed_records(frame)]
+    return b'[' + b','.join(rows) + b']'
+
+
+def column_wise(frame) -> bytes:
+    return b'[' + b','.join(json_rows(frame)) + b']'
+
+
+PATHS = {
+    'to_dict + scrub + jsonify': legacy,
+    'to_dict + scrub + json.dumps': per_record,
+    'column-wise': column_wise,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    index = CollegeIndex.load(CSV_PATH)
+    frames = {key: bucket.all_rows() for key, bucket in index.buckets.items()}
+    largest_key = max(frames, key=lambda key: len(frames[key]))
+
+    for key, frame in frames.items():
+        expected = json.loads(legacy(frame))
+        for name, function in PATHS.items():
+            if json.loads(function(frame)) != expected:
+                raise SystemExit(f"{name} differs from the old output for {key}")
+
+    rounds = [
+        (f"largest list {largest_key} ({len(frames[largest_key])} rows)", [frames[largest_key]], args.repeat),
+        (f"all {len(frames)} lists ({sum(len(frame) for frame in frames.values())} rows)",
+         list(frames.values()), max(1, args.repeat // 10)),
+    ]
+    for label, selected, repeat in rounds:
+        print(label)
+        baseline = None
+        for name, function in PATHS.items():
+            ms = best_ms(lambda: [function(frame) for frame in selected], repeat)
+            baseline = baseline or ms
+            print(f"  {name:<30} {ms:9.2f} ms  {baseline / ms:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
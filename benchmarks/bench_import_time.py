@@ -0,0 +1,80 @@
+"""
+Import time of each deployment entry point, the cold-start cost before the
+first request: the Vercel functions (api/predict, api/colleges, api/health)
+and the Flask backend (backend/app.py, as gunicorn and api/index.py load it).
+
+Each entry point is imported in a fresh interpreter. Reported: wall time of
+the import, peak RSS, and which heavy modules (pandas, NumPy, flask-cors) it
+pulled in.
+
+Usage: python benchmarks/bench_import_time.py [--runs N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (directory put first on sys.path, module imported)
+ENTRY_POINTS = {
+    'api/predict': (os.path.join(ROOT_DIR, 'api', 'predict'), 'index'),
+    'api/colleges': (os.path.join(ROOT_DIR, 'api', 'colleges'), 'index'),
+    'api/health': (os.path.join(ROOT_DIR, 'api', 'health'), 'index'),
+    'backend/app': (os.path.join(ROOT_DIR, 'backend'), 'app'),
+}
+
+HEAVY_MODULES = ['pandas', 'numpy', 'flask_cors']
+
+CHILD = """
+import importlib, json, resource, sys, time
+import flask  # every entry point needs Flask; timed separately below
+sys.path.insert(0, {directory!r})
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{'import_ms': elapsed * 1000,
+                  'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  'heavy': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+FLASK_CHILD = """
+import json, time
+start = time.perf_counter()
+import flask
+print(json.dumps({'import_ms': (time.perf_counter() - start) * 1000}))
+"""
+
+
+def run(code: str) -> dict:
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT_DIR, stderr=subprocess.DEVNULL)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def measure(directory: str, module: str, runs: int) -> dict:
+    code = CHILD.format(directory=directory, module=module, heavy=HEAVY_MODULES)
+    samples = [run(code) for _ in range(runs)]
+    return {
+        'import_ms': min(sample['import_ms'] for sample in samples),
+        'peak_rss_mb': min(sample['peak_rss_mb'] for sample in samples),
+        'heavy': samples[0]['heavy'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    flask_ms = min(run(FLASK_CHILD)['import_ms'] for _ in range(args.runs))
+    print(f"flask itself: {flask_ms:.1f} ms (not included below)")
+    print(f"{'entry point':<14} {'import':>10} {'peak RSS':>10}  heavy modules")
+    for name, (directory, module) in ENTRY_POINTS.items():
+        result = measure(directory, module, args.runs)
+        print(f"{name:<14} {result['import_ms']:8.1f}ms {result['peak_rss_mb']:8.1f}MB  "
+              f"{', '.join(result['heavy']) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Accuracy check and per-call microbenchmark for the logistic segment of
+percentile_to_percentage: closed-form inverse vs the old 50-step bisection.
+
+The bisection stopped once |percentage_to_percentile(x) - percentile| < 0.001;
+the closed form must meet the same tolerance everywhere on the segment.
+
+Usage: python benchmarks/bench_percentile_inverse.py [--points N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from prediction import (  # noqa: E402
+    DEFAULT_MODEL, percentage_to_percentile, percentile_to_percentage,
+)
+
+TOLERANCE = 0.001
+
+
+def bisection_percentile_to_percentage(percentile: float) -> float:
+    """The logistic-segment search percentile_to_percentage used before."""
+    low, high = 0, 25
+    for _ in range(50):
+        mid = (low + high) / 2
+        test_percentile = percentage_to_percentile(mid)
+        if abs(test_percentile - percentile) < TOLERANCE:
+            return mid
+        if test_percentile < percentile:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=200000)
+    args = parser.parse_args()
+
+    # Percentiles reachable on the segment: f(0) .. f(25)
+    lowest = percentage_to_percentile(0)
+    highest = DEFAULT_MODEL.percentile_curve.logistic_top
+    grid = [lowest + (highest - lowest) * i / (args.points - 1) for i in range(args.points)]
+
+    worst_error = max(abs(percentage_to_percentile(percentile_to_percentage(p)) - p) for p in grid)
+    worst_shift = max(abs(percentile_to_percentage(p) - bisection_percentile_to_percentage(p)) for p in grid)
+    print(f"closed form: max |f(x) - percentile| = {worst_error:.2e} over {args.points} points "
+          f"(tolerance {TOLERANCE}) -> {'OK' if worst_error < TOLERANCE else 'FAIL'}")
+    print(f"max |closed form - bisection| = {worst_shift:.4f} percentage points")
+
+    sample = grid[::max(1, len(grid) // 1000)]
+    functions = [('bisection', bisection_percentile_to_percentage), ('closed form', percentile_to_percentage)]
+    for name, function in functions:
+        seconds = min(timeit.repeat(lambda: [function(p) for p in sample], number=20, repeat=5))
+        print(f"{name:<12} {seconds / (20 * len(sample)) * 1e6:.2f} us/call")
+
+    if worst_error >= TOLERANCE:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
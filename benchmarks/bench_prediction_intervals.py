@@ -0,0 +1,53 @@
+"""
+Cost of the optional confidence intervals on /api/predict: time of
+prediction_intervals per input type and category, and of a whole predict
+request with and without "intervals" (in-process Flask client).
+
+Usage: python benchmarks/bench_prediction_intervals.py [--repeat N]
+       UNCERTAINTY_SAMPLES=8192 python benchmarks/bench_prediction_intervals.py
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from app import app  # noqa: E402
+from prediction import DEFAULT_MODEL, predict_results  # noqa: E402
+from timing import best_ms  # noqa: E402
+from uncertainty import SAMPLES, prediction_intervals  # noqa: E402
+
+INPUTS = {
+    'marks': 150,
+    'percentage': 55.5,
+    'percentile': 97.5,
+    'allIndiaRank': 40000,
+    'categoryRank': 3000,
+}
+CATEGORIES = ['OPEN', 'OBC-NCL', 'SC', 'ST', 'EWS']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{SAMPLES} samples per request")
+    print(f"{'input type':<14}" + ''.join(f"{category:>10}" for category in CATEGORIES))
+    for input_type, value in INPUTS.items():
+        timings = []
+        for category in CATEGORIES:
+            results = predict_results(category, input_type, value)
+            timings.append(best_ms(
+                lambda: prediction_intervals(category, input_type, results, DEFAULT_MODEL), args.repeat))
+        print(f"{input_type:<14}" + ''.join(f"{ms:8.3f}ms" for ms in timings))
+
+    client = app.test_client()
+    payload = {'category': 'SC', 'inputType': 'marks', 'inputValue': 150}
+    plain = best_ms(lambda: client.post('/api/predict', json=payload), args.repeat)
+    with_intervals = best_ms(lambda: client.post('/api/predict', json=dict(payload, intervals=True)), args.repeat)
+    print(f"/api/predict request: {plain:.3f} ms, with intervals {with_intervals:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
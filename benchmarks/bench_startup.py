@@ -0,0 +1,59 @@
+"""
+Compare cold-start cost of loading the college index from the CSV versus the
+columnar snapshot (build it first with `python backend/snapshot.py`).
+
+Each mode runs in a fresh interpreter and reports load time and peak RSS.
+
+Usage: python benchmarks/bench_startup.py [--runs N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {backend!r})
+import pandas, numpy  # imported up front so both modes only time the data load
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+from college_index import CSV_PATH, CollegeIndex
+start = time.perf_counter()
+if {mode!r} == 'csv':
+    df = pandas.read_csv(CSV_PATH)
+else:
+    from snapshot import load_snapshot
+    df = load_snapshot(CSV_PATH)
+    assert df is not None, 'snapshot missing or stale: run python backend/snapshot.py'
+loaded = time.perf_counter() - start
+index = CollegeIndex(df)
+total = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'load_ms': loaded * 1000, 'index_ms': total * 1000,
+                  'peak_rss_mb': rss / 1024, 'data_rss_mb': (rss - baseline) / 1024}}))
+"""
+
+
+def measure(mode: str, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', CHILD.format(backend=BACKEND_DIR, mode=mode)])
+        samples.append(json.loads(output.decode().strip().splitlines()[-1]))
+    return {key: min(sample[key] for sample in samples) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    for mode in ['csv', 'snapshot']:
+        result = measure(mode, args.runs)
+        print(f"{mode:<9} load {result['load_ms']:6.1f} ms  load+index {result['index_ms']:6.1f} ms  "
+              f"peak RSS {result['peak_rss_mb']:6.1f} MB  (+{result['data_rss_mb']:.1f} MB for data)")
+
+
+if __name__ == '__main__':
+    main()
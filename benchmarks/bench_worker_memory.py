@@ -0,0 +1,109 @@
+"""
+Per-worker memory of the gunicorn backend, with and without preloading the
+app and its data in the master (backend/gunicorn.conf.py).
+
+Starts gunicorn with N workers, sends /api/predict and /api/colleges requests
+until every worker has served some, then reads /proc/<pid>/smaps_rollup of
+each worker: RSS counts shared pages in full, PSS splits them between the
+processes sharing them, and USS is the memory only that worker holds.
+Linux only.
+
+Usage: python benchmarks/bench_worker_memory.py [--workers N] [--requests N]
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(ROOT_DIR, 'backend', 'gunicorn.conf.py')
+
+CATEGORIES = ['OPEN', 'OBC-NCL', 'SC', 'ST', 'EWS']
+STATES = ['Maharashtra', 'Delhi', 'Karnataka', 'Tamil Nadu', 'Uttar Pradesh', 'Goa']
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def post(url: str, payload: dict) -> dict:
+    request = urllib.request.Request(url, json.dumps(payload).encode(), {'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def worker_pids(master_pid: int) -> list:
+    with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def memory_mb(pid: int) -> dict:
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return {
+        'rss': fields['Rss'],
+        'pss': fields['Pss'],
+        'uss': fields['Private_Clean'] + fields['Private_Dirty'],
+    }
+
+
+def measure(preload: bool, workers: int, requests: int) -> tuple:
+    """(master memory, [worker memory]) in MB after serving `requests` rounds."""
+    port = free_port()
+    command = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--chdir', 'backend',
+               '--workers', str(workers), '--log-level', 'warning']
+    if preload:
+        command += ['--config', CONFIG_PATH]
+    server = subprocess.Popen(command + ['app:app'], cwd=ROOT_DIR, stdout=subprocess.DEVNULL)
+    base = f'http://127.0.0.1:{port}'
+    try:
+        for _ in range(600):
+            try:
+                urllib.request.urlopen(f'{base}/api/health').read()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        # Spread requests so every worker loads the data and fills its caches
+        for i in range(requests):
+            category = CATEGORIES[i % len(CATEGORIES)]
+            post(f'{base}/api/predict', {'category': category, 'inputType': 'marks', 'inputValue': i % 300})
+            post(f'{base}/api/colleges', {'category': category, 'categoryRank': 1000 + 37 * i,
+                                          'gender': 'Female' if i % 2 else 'Male',
+                                          'state': STATES[i % len(STATES)]})
+        return memory_mb(server.pid), [memory_mb(pid) for pid in worker_pids(server.pid)]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=400)
+    args = parser.parse_args()
+
+    for preload in [False, True]:
+        master, samples = measure(preload, args.workers, args.requests)
+        label = 'preload' if preload else 'per-worker load'
+        print(f"{label} ({len(samples)} workers)")
+        print(f"  master  RSS {master['rss']:6.1f} MB  PSS {master['pss']:6.1f} MB  USS {master['uss']:6.1f} MB")
+        for sample in samples:
+            print(f"  worker  RSS {sample['rss']:6.1f} MB  PSS {sample['pss']:6.1f} MB  USS {sample['uss']:6.1f} MB")
+        total = master['pss'] + sum(sample['pss'] for sample in samples)
+        print(f"  total PSS {total:6.1f} MB  "
+              f"mean worker USS {sum(sample['uss'] for sample in samples) / len(samples):6.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
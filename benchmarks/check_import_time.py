@@ -0,0 +1,96 @@
+"""
+Startup budget check for the prediction path: a fresh interpreter imports
+backend/app.py under `python -X importtime`, then answers one /api/predict
+and one /api/health request. Fails (exit status 1) if
+
+- importing app.py and its modules takes longer than the budget (Flask and
+  its dependencies are imported first and not counted; every entry point
+  needs them), or
+- pandas or NumPy is imported at any point, at import or by the requests.
+
+Also reports the slowest modules in app.py's import tree.
+
+Usage: python benchmarks/check_import_time.py [--budget-ms MS] [--runs N]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+# Cumulative import time allowed for app.py, in milliseconds
+BUDGET_MS = 100
+
+FORBIDDEN_MODULES = ['pandas', 'numpy']
+
+CHILD = """
+import sys
+import flask, flask_cors  # not counted
+sys.path.insert(0, {backend!r})
+import app
+client = app.app.test_client()
+body = {{'category': 'SC', 'inputType': 'marks', 'inputValue': 150}}
+assert client.post('/api/predict', json=body).status_code == 200
+assert client.get('/api/health').status_code == 200
+print('loaded:', ' '.join(name for name in {forbidden!r} if name in sys.modules))
+"""
+
+# import time: self [us] | cumulative | imported package
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def run_child() -> tuple:
+    """(cumulative import ms of app, [(self ms, module)], forbidden modules loaded)."""
+    environment = dict(os.environ, COLLEGE_WARM_UP='0')
+    code = CHILD.format(backend=BACKEND_DIR, forbidden=FORBIDDEN_MODULES)
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                             env=environment)
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+
+    # A module is listed after everything it imported, so app's tree is the
+    # run of lines ending at the top-level "app" line
+    app_ms, modules, tree = None, [], []
+    for line in process.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match is None or app_ms is not None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        tree.append((int(self_us) / 1000, name))
+        if len(indent) == 1:
+            if name == 'app':
+                app_ms, modules = int(cumulative_us) / 1000, tree
+            tree = []
+    loaded = process.stdout.strip().splitlines()[-1].split()[1:]
+    return app_ms, modules, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    runs = [run_child() for _ in range(args.runs)]
+    app_ms, modules, _ = min(runs, key=lambda run: run[0])
+    print(f"import app: {app_ms:.1f} ms (budget {args.budget_ms:.0f} ms), best of {args.runs}")
+    for self_ms, name in sorted(modules, reverse=True)[:8]:
+        print(f"  {self_ms:7.2f} ms  {name}")
+
+    failures = []
+    if app_ms > args.budget_ms:
+        failures.append(f"import app took {app_ms:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    loaded = sorted({name for run in runs for name in run[2]})
+    if loaded:
+        failures.append(f"prediction path imported {', '.join(loaded)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
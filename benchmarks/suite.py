@@ -0,0 +1,362 @@
+"""
+Benchmark and load-test suite for the prediction and college endpoints. Runs
+offline and writes its results as JSON, so runs can be compared.
+
+Sections (all by default; choose with --sections):
+- micro: time per call of each conversion function (percentage_to_percentile,
+  percentile_to_percentage, air_to_cat, cat_to_air) on every model segment
+  and category
+- predict: /api/predict latency for every inputType (Flask test client)
+- colleges: /api/colleges latency for every category x gender x state, the
+  first (uncached) request and repeated ones (Flask test client)
+- load: concurrent clients against a local gunicorn (or uvicorn) for a set
+  time, with requests/sec and p50/p95/p99 latency per endpoint
+
+Usage: python benchmarks/suite.py [--sections micro,predict,colleges,load]
+                                  [--quick] [--output PATH] [--compare OLD.json]
+                                  [--server gunicorn|uvicorn] [--workers N]
+                                  [--concurrency N] [--seconds S]
+"""
+import argparse
+import asyncio
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'backend'))
+
+from bench_asgi_load import fetch, free_port, server_command  # noqa: E402
+from prediction import (  # noqa: E402
+    DEFAULT_MODEL, air_to_cat, cat_to_air, percentage_to_percentile, percentile_to_percentage,
+)
+
+SECTIONS = ['micro', 'predict', 'colleges', 'load']
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+
+# The frontend's choices
+CATEGORIES = ['OPEN', 'OBC-NCL', 'SC', 'ST', 'EWS']
+GENDERS = ['Male', 'Female']
+STATES = ['Andhra Pradesh', 'Arunachal Pradesh', 'Assam', 'Bihar', 'Chhattisgarh',
+          'Goa', 'Gujarat', 'Haryana', 'Himachal Pradesh', 'Jharkhand',
+          'Karnataka', 'Kerala', 'Madhya Pradesh', 'Maharashtra', 'Manipur',
+          'Meghalaya', 'Mizoram', 'Nagaland', 'Odisha', 'Punjab',
+          'Rajasthan', 'Sikkim', 'Tamil Nadu', 'Telangana', 'Tripura',
+          'Uttar Pradesh', 'Uttarakhand', 'West Bengal', 'Jammu and Kashmir',
+          'Delhi', 'Puducherry', 'Chandigarh', 'Ladakh']
+
+# Inputs per function: one per model segment, and every category for the rank models
+MICRO_CASES = {
+    'percentage_to_percentile': [('logistic', 15.0), ('logarithmic', 30.0), ('exponential', 60.0)],
+    'percentile_to_percentage': [('logistic', 80.0), ('logarithmic', 96.0), ('exponential', 99.5)],
+    'air_to_cat': [(category, 50000) for category in CATEGORIES],
+    'cat_to_air': [(category, 5000) for category in CATEGORIES],
+}
+
+# inputType -> value range of the predict requests
+PREDICT_RANGES = {
+    'marks': (0, 300),
+    'percentage': (0.0, 100.0),
+    'percentile': (50.0, 99.99),
+    'allIndiaRank': (1, 1200000),
+    'categoryRank': (1, 200000),
+}
+
+RANKS = [100, 1000, 10000, 50000, 150000]
+
+
+def summary(latencies: list) -> dict:
+    """Count, mean and percentiles (ms) of latencies in seconds."""
+    latencies = sorted(latencies)
+    if not latencies:
+        return {'count': 0}
+
+    def percentile(q: float) -> float:
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000
+
+    return {
+        'count': len(latencies),
+        'mean_ms': sum(latencies) / len(latencies) * 1000,
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'max_ms': latencies[-1] * 1000,
+    }
+
+
+# ============================
+# Sections
+# ============================
+
+def run_micro(quick: bool) -> dict:
+    functions = {
+        'percentage_to_percentile': percentage_to_percentile,
+        'percentile_to_percentage': percentile_to_percentage,
+        'air_to_cat': air_to_cat,
+        'cat_to_air': cat_to_air,
+    }
+    results = {}
+    for name, cases in MICRO_CASES.items():
+        results[name] = {}
+        for label, value in cases:
+            if name in ('air_to_cat', 'cat_to_air'):
+                statement, names = 'f(c, x, m)', {'f': functions[name], 'c': label, 'x': value, 'm': DEFAULT_MODEL}
+            else:
+                statement, names = 'f(x)', {'f': functions[name], 'x': value}
+            timer = timeit.Timer(statement, globals=names)
+            number, _ = timer.autorange()
+            best = min(timer.repeat(repeat=3 if quick else 7, number=number)) / number
+            results[name][label] = {'ns_per_call': best * 1e9}
+    return results
+
+
+def timed_post(client, path: str, payload: dict) -> tuple:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        response = client.post(path, json=payload)
+    return time.perf_counter() - start, response
+
+
+def run_predict(client, quick: bool) -> dict:
+    rng = random.Random(2024)
+    requests_per_type = 200 if quick else 2000
+    results = {}
+    for input_type, (low, high) in PREDICT_RANGES.items():
+        latencies, errors = [], 0
+        for i in range(requests_per_type):
+            value = rng.randint(low, high) if isinstance(low, int) else round(rng.uniform(low, high), 2)
+            payload = {'category': CATEGORIES[i % len(CATEGORIES)], 'inputType': input_type, 'inputValue': value}
+            elapsed, response = timed_post(client, '/api/predict', payload)
+            latencies.append(elapsed)
+            errors += response.status_code != 200
+        results[input_type] = dict(summary(latencies), errors=errors)
+    return results
+
+
+def run_colleges(client, quick: bool) -> dict:
+    import app
+
+    repeats = 2 if quick else len(RANKS)
+    # Datasets loaded up front so the first cell does not include that; lists built per cell
+    app.load_colleges()
+    app.college_cache.clear()
+    cells, first, repeated = {}, [], []
+    for category in CATEGORIES:
+        for gender in GENDERS:
+            for state in STATES:
+                candidate = {'category': category, 'gender': gender, 'state': state}
+                cold, response = timed_post(client, '/api/colleges', dict(candidate, categoryRank=RANKS[0]))
+                warm = [timed_post(client, '/api/colleges', dict(candidate, categoryRank=rank))[0]
+                        for rank in RANKS[:repeats]]
+                first.append(cold)
+                repeated.extend(warm)
+                cells[f"{category}|{gender}|{state}"] = {
+                    'first_ms': cold * 1000,
+                    'repeated_p50_ms': sorted(warm)[len(warm) // 2] * 1000,
+                    'colleges': len(response.get_json().get('colleges', [])),
+                    'status': response.status_code,
+                }
+    return {
+        'summary': {
+            'cells': len(cells),
+            'errors': sum(cell['status'] != 200 for cell in cells.values()),
+            'first': summary(first),
+            'repeated': summary(repeated),
+        },
+        'cells': cells,
+    }
+
+
+def load_request(rng: random.Random) -> tuple:
+    """(endpoint, raw HTTP request) of the load mix: half predictions, half college lists."""
+    category = rng.choice(CATEGORIES)
+    if rng.random() < 0.5:
+        path = '/api/predict'
+        input_type = rng.choice(list(PREDICT_RANGES))
+        low, high = PREDICT_RANGES[input_type]
+        value = rng.randint(low, high) if isinstance(low, int) else rng.uniform(low, high)
+        payload = {'category': category, 'inputType': input_type, 'inputValue': value}
+    else:
+        path = '/api/colleges'
+        payload = {'category': category, 'categoryRank': rng.randint(1, 100000),
+                   'gender': rng.choice(GENDERS), 'state': rng.choice(STATES)}
+    body = json.dumps(payload).encode()
+    return path, (f'POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+                  f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n').encode() + body
+
+
+async def generate_load(port: int, concurrency: int, seconds: float) -> dict:
+    until = time.perf_counter() + seconds
+    latencies = {'/api/predict': [], '/api/colleges': []}
+    errors = 0
+
+    async def client(seed: int):
+        nonlocal errors
+        rng = random.Random(seed)
+        while time.perf_counter() < until:
+            path, data = load_request(rng)
+            start = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(fetch(port, data), timeout=30)
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                status = None
+            if status == 200:
+                latencies[path].append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(seed) for seed in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    everything = [latency for values in latencies.values() for latency in values]
+    return {
+        'seconds': elapsed,
+        'errors': errors,
+        'rps': len(everything) / elapsed,
+        'all': summary(everything),
+        'endpoints': {path: dict(summary(values), rps=len(values) / elapsed) for path, values in latencies.items()},
+    }
+
+
+def run_load(server: str, workers: int, concurrency: int, seconds: float) -> dict:
+    port = free_port()
+    process = subprocess.Popen(server_command(server, port, workers), cwd=ROOT_DIR,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(600):
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health').read()
+                break
+            except OSError:
+                time.sleep(0.1)
+        asyncio.run(generate_load(port, concurrency, 1.0))  # warm caches in every worker
+        result = asyncio.run(generate_load(port, concurrency, seconds))
+    finally:
+        process.terminate()
+        process.wait()
+    return dict(result, server=server, workers=workers, concurrency=concurrency)
+
+
+# ============================
+# Reports
+# ============================
+
+def metadata(args) -> dict:
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                         stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'model': DEFAULT_MODEL.name,
+        'args': vars(args),
+    }
+
+
+def flatten(value, prefix: str = '') -> dict:
+    """Numeric leaves by dotted path (the per-cell colleges matrix left out)."""
+    if isinstance(value, dict):
+        leaves = {}
+        for key, item in value.items():
+            if key not in ('cells', 'meta'):
+                leaves.update(flatten(item, f"{prefix}{key}."))
+        return leaves
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix[:-1]: value}
+    return {}
+
+
+def compare(previous: dict, current: dict):
+    """Print every timing and throughput present in both runs, with the change."""
+    old, new = flatten(previous), flatten(current)
+    print(f"\nCompared with {previous['meta'].get('commit')} ({previous['meta'].get('time')})")
+    for key in sorted(old.keys() & new.keys()):
+        if not key.endswith(('_ms', 'ns_per_call', 'rps')) or not old[key]:
+            continue
+        change = (new[key] - old[key]) / old[key] * 100
+        print(f"  {key:<60} {old[key]:12.3f} {new[key]:12.3f} {change:+7.1f}%")
+
+
+def print_results(results: dict):
+    for name, cases in results.get('micro', {}).items():
+        print(f"{name:<26}" + ''.join(f"  {label} {case['ns_per_call']:.0f} ns" for label, case in cases.items()))
+    for input_type, stats in results.get('predict', {}).items():
+        print(f"/api/predict {input_type:<14} p50 {stats['p50_ms']:.3f} ms  p95 {stats['p95_ms']:.3f} ms  "
+              f"p99 {stats['p99_ms']:.3f} ms  ({stats['errors']} errors)")
+    if 'colleges' in results:
+        matrix = results['colleges']['summary']
+        for kind in ['first', 'repeated']:
+            stats = matrix[kind]
+            print(f"/api/colleges {kind:<9} p50 {stats['p50_ms']:.3f} ms  p95 {stats['p95_ms']:.3f} ms  "
+                  f"p99 {stats['p99_ms']:.3f} ms  over {matrix['cells']} cells ({matrix['errors']} errors)")
+    if 'load' in results:
+        load = results['load']
+        print(f"load: {load['server']} x{load['workers']}, {load['concurrency']} clients: {load['rps']:.0f} req/s, "
+              f"{load['errors']} errors")
+        for path, stats in load['endpoints'].items():
+            print(f"  {path:<14} {stats['rps']:7.0f} req/s  p50 {stats['p50_ms']:.1f} ms  "
+                  f"p95 {stats['p95_ms']:.1f} ms  p99 {stats['p99_ms']:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sections', default=','.join(SECTIONS))
+    parser.add_argument('--quick', action='store_true', help='fewer repeats, for a smoke run')
+    parser.add_argument('--output', help='JSON file (default benchmarks/results/suite-<time>.json)')
+    parser.add_argument('--compare', help='earlier results JSON to compare with')
+    parser.add_argument('--server', choices=['gunicorn', 'uvicorn'], default='gunicorn')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    sections = [section.strip() for section in args.sections.split(',') if section.strip()]
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+
+    results = {'meta': metadata(args)}
+    if 'micro' in sections:
+        results['micro'] = run_micro(args.quick)
+    if 'predict' in sections or 'colleges' in sections:
+        from app import app
+        client = app.test_client()
+        if 'predict' in sections:
+            results['predict'] = run_predict(client, args.quick)
+        if 'colleges' in sections:
+            results['colleges'] = run_colleges(client, args.quick)
+    if 'load' in sections:
+        results['load'] = run_load(args.server, args.workers, args.concurrency,
+                                   min(args.seconds, 3) if args.quick else args.seconds)
+
+    print_results(results)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"suite-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=1, sort_keys=True)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,12 @@
+"""Timing helper shared by the benchmarks in this directory."""
+import time
+
+
+def best_ms(function, repeat: int) -> float:
+    """Fastest of `repeat` calls of function(), in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
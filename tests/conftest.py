@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Backend modules import each other as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+# Tests load the college data when they need it, not in a background thread
+os.environ.setdefault('COLLEGE_WARM_UP', '0')
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from response_cache import eligible_counts
+
+THRESHOLDS = [-1e6, -1, 0, 1, 500, 999.5, 1000, 1001, 5e4, 1e12, 1e20]
+
+
+def plain_counts(closing_ranks, thresholds, codes, groups):
+    return np.array([[int(((codes == code) & (closing_ranks >= threshold)).sum()) for threshold in thresholds]
+                     for code in range(groups)])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_eligible_counts_match_plain_counts(seed):
+    rng = np.random.default_rng(seed)
+    closing_ranks = np.sort(rng.integers(1, 1001, 300)).astype(np.float64)
+    codes = rng.integers(-1, 4, 300)
+    thresholds = np.array(THRESHOLDS)
+
+    assert eligible_counts(closing_ranks, thresholds).tolist() == \
+        [int((closing_ranks >= threshold).sum()) for threshold in THRESHOLDS]
+    assert eligible_counts(closing_ranks, thresholds, codes, 4).tolist() == \
+        plain_counts(closing_ranks, thresholds, codes, 4).tolist()
+
+
+@pytest.fixture(scope='module')
+def client():
+    from app import app
+    return app.test_client()
+
+
+def test_curve_groups_match_plain_counts(client):
+    from app import college_list
+
+    candidate = {'category': 'OPEN', 'gender': 'Male', 'state': 'Goa'}
+    ranks = [0, 1, 1000, 50000, 10 ** 20]
+    response = client.post('/api/colleges/curve', json=dict(candidate, ranks=ranks, groupBy='collegeType'))
+    assert response.status_code == 200
+    groups = response.get_json()['groups']
+
+    _, colleges = college_list(candidate)
+    labels = colleges.filters.labels['collegeType']
+    thresholds = 0.9 * np.array(ranks, dtype=np.float64)
+    expected = plain_counts(colleges.bucket.closing_ranks, thresholds, colleges.filters.codes['collegeType'],
+                            len(labels))
+    for code, label in enumerate(labels):
+        assert groups[label]['eligible'] == expected[code].tolist()
+
+
+@pytest.mark.parametrize('fields', [{'ranks': [-1000000, 1000]}, {'ranks': [1, 'NaN']}, {'minRank': -5}])
+def test_curve_rejects_negative_and_non_finite_ranks(client, fields):
+    body = dict({'category': 'OPEN', 'gender': 'Male', 'state': 'Goa'}, **fields)
+    response = client.post('/api/colleges/curve', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+# Same requests as benchmarks/check_import_time.py, which also times the import
+CHILD = """
+import sys
+sys.path.insert(0, {backend!r})
+import app
+client = app.app.test_client()
+body = {{'category': 'SC', 'inputType': 'marks', 'inputValue': 150}}
+assert client.post('/api/predict', json=body).status_code == 200
+assert client.get('/api/health').status_code == 200
+print(' '.join(name for name in ['pandas', 'numpy'] if name in sys.modules))
+"""
+
+
+def test_prediction_path_does_not_import_pandas_or_numpy():
+    process = subprocess.run([sys.executable, '-c', CHILD.format(backend=BACKEND_DIR)], capture_output=True,
+                             text=True, env=dict(os.environ, COLLEGE_WARM_UP='0'))
+    assert process.returncode == 0, process.stderr
+    assert process.stdout.strip() == ''
@@ -0,0 +1,36 @@
+import threading
+
+import registry
+
+
+def test_poll_does_not_wait_for_the_datasets(monkeypatch):
+    load_registry = registry.load_registry
+    loading = threading.Event()
+    finish = threading.Event()
+
+    def slow_load(manifest_path, previous=None, datasets=True):
+        snapshot = load_registry(manifest_path, previous=previous, datasets=False)
+        if not datasets:
+            return snapshot
+        loading.set()
+        finish.wait(10)
+        return registry.RegistrySnapshot(snapshot.default_year, snapshot.years, snapshot.models, {},
+                                         snapshot.stamps)
+
+    monkeypatch.setattr(registry, 'load_registry', slow_load)
+    reg = registry.Registry(poll_seconds=0)
+    models_only = reg.current()
+
+    thread = threading.Thread(target=reg.current, kwargs={'datasets': True})
+    thread.start()
+    try:
+        assert loading.wait(10)
+        # Requests keep getting the models-only snapshot, and polling it does not block
+        assert reg._lock.acquire(timeout=1)
+        reg._lock.release()
+        assert reg.current() is models_only
+    finally:
+        finish.set()
+        thread.join(10)
+
+    assert reg.current(datasets=True).datasets == {}
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+import prediction
+import vectorized
+
+CATEGORIES = ['OPEN', 'OBC-NCL', 'EWS', 'SC', 'ST']
+INPUT_TYPES = ['marks', 'percentage', 'percentile', 'allIndiaRank', 'categoryRank']
+
+# Segment edges, exp overflow (percentage below about -4631), ranks past int64
+# and past the category models, and values up to the batch endpoint's 1e15 limit
+EDGES = [0, 0.5, 1, 24.99, 25, 25.01, 40, 40.01, 94.417, 97.796, 99.99999, 100, 299.5, 300, 301,
+         -1, -4631, -4632, -5000, -1e5, 1e5, 1e10, 7e14, 9.99e14]
+
+
+def input_values(seed):
+    rng = np.random.default_rng(seed)
+    magnitudes = 10 ** rng.uniform(-2, 14.99, 2000)
+    values = np.concatenate([EDGES, np.negative(EDGES), rng.choice([-1, 1], 2000) * magnitudes,
+                             rng.uniform(-10, 310, 2000)])
+    return values.tolist()
+
+
+@pytest.mark.parametrize('category', CATEGORIES)
+@pytest.mark.parametrize('input_type', INPUT_TYPES)
+def test_vectorized_matches_scalar(category, input_type):
+    values = input_values(len(category) * 10 + len(input_type))
+    arrays = vectorized.predict_results(category, input_type, np.array(values))
+
+    for i, value in enumerate(values):
+        try:
+            expected = prediction.predict_results(category, input_type, value)
+        except (ValueError, OverflowError):
+            assert not arrays['valid'][i], value
+            continue
+        # Not valid only where a rank is too large for int64 (the batch endpoint recomputes those)
+        if arrays['valid'][i]:
+            assert {field: arrays[field][i].item() for field in expected} == expected, value
+        else:
+            assert abs(expected['allIndiaRank']) >= 2 ** 63 or abs(expected['categoryRank']) >= 2 ** 63, value
+
+
+def test_batch_matches_single_predictions():
+    from app import app
+
+    client = app.test_client()
+    records = [{'category': category, 'inputType': input_type, 'inputValue': value}
+               for category in ['OPEN', 'ST'] for input_type in INPUT_TYPES
+               for value in EDGES + [-value for value in EDGES]]
+    body = client.post('/api/predict/batch', json=records).get_json()
+
+    assert body['count'] == len(records)
+    for record, result in zip(records, body['results']):
+        assert result == client.post('/api/predict', json=record).get_json(), record